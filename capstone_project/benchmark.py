@@ -0,0 +1,119 @@
+import argparse
+import json
+import os
+import platform
+import tempfile
+from datetime import datetime
+from pathlib import Path
+
+import matplotlib
+matplotlib.use('Agg')
+import numpy as np
+import pandas as pd
+
+import energy
+
+def make_campus(data_dir, n_buildings, years, freq, start_date='2023-01-01', generator='legacy',
+                workers=1, file_format='csv', seed=0):
+    end_date = pd.Timestamp(start_date) + pd.DateOffset(years=years) - pd.tseries.frequencies.to_offset(freq)
+    if generator == 'fast':
+        return energy.generate_synthetic_campus(
+            data_dir, n_buildings, start_date, end_date, freq=freq, seed=seed, workers=workers, file_format=file_format
+        )
+    # Same generator as setup_environment, one seed per building so the series differ
+    buildings = [f"Building_{i:04d}" for i in range(n_buildings)]
+    energy.write_campus_data(data_dir, buildings, start_date, end_date, freq=freq, seeds=range(n_buildings))
+    return buildings
+
+def run_stage(profiler, name, func, rows=None):
+    with profiler.stage(name, rows) as record:
+        value = func()
+    print(f"{name:<12} {record['seconds']:>9.3f}s  peak {record['traced_peak_mb']:>9.2f} MB")
+    return value
+
+def run_benchmark(args):
+    profiler = energy.PipelineProfiler(trace_memory=True)
+    work_dir = Path(args.work_dir) if args.work_dir else Path(tempfile.mkdtemp(prefix='energy_bench_'))
+    work_dir.mkdir(parents=True, exist_ok=True)
+    previous_dir = Path.cwd()
+    # The pipeline writes its outputs into the working directory
+    os.chdir(work_dir)
+    try:
+        run_stage(profiler, 'generate', lambda: make_campus(
+            'data', args.buildings, args.years, args.freq,
+            generator=args.generator, workers=args.workers, file_format=args.file_format, seed=args.seed
+        ))
+        manager = energy.BuildingManager()
+        if args.streaming:
+            run_stage(profiler, 'ingest', lambda: manager.ingest_streaming(
+                'data', args.chunksize or 500_000, args.workers, trace_memory=True
+            ))
+        else:
+            run_stage(profiler, 'ingest', lambda: manager.ingest_data(
+                'data', workers=args.workers, chunksize=args.chunksize, cache_format=args.cache_format, trace_memory=True
+            ))
+        rows = sum(timing['rows'] for timing in manager.file_timings)
+        ingest = profiler.stages[-1]
+        ingest['rows'] = rows
+        ingest['rows_per_second'] = round(rows / ingest['seconds']) if ingest['seconds'] else None
+        profiler.add_files(manager.file_timings)
+
+        summary_df = run_stage(profiler, 'export', manager.export_data, rows)
+        run_stage(profiler, 'report', lambda: manager.generate_report(summary_df))
+        if not args.skip_plots:
+            run_stage(profiler, 'visualize', manager.visualize_data)
+    finally:
+        os.chdir(previous_dir)
+
+    return {
+        'timestamp': datetime.now().isoformat(timespec='seconds'),
+        'label': args.label,
+        'config': {
+            'buildings': args.buildings,
+            'years': args.years,
+            'freq': args.freq,
+            'workers': args.workers,
+            'chunksize': args.chunksize,
+            'cache_format': args.cache_format,
+            'streaming': args.streaming,
+            'generator': args.generator,
+            'file_format': args.file_format,
+            'seed': args.seed
+        },
+        'environment': {
+            'python': platform.python_version(),
+            'pandas': pd.__version__,
+            'numpy': np.__version__,
+            'machine': platform.machine()
+        },
+        'work_dir': str(work_dir),
+        **profiler.report()
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the campus energy pipeline on synthetic data.")
+    parser.add_argument('--buildings', type=int, default=4, help="Number of buildings to generate")
+    parser.add_argument('--years', type=int, default=1, help="Years of readings per building")
+    parser.add_argument('--freq', default='H', help="Reading frequency, e.g. H or 15min")
+    parser.add_argument('--generator', default='legacy', choices=['legacy', 'fast'],
+                        help="legacy: setup_environment's generator; fast: batched, parallel generate_synthetic_campus")
+    parser.add_argument('--file-format', default='csv', choices=['csv', 'parquet', 'feather'],
+                        help="Meter file format written by the fast generator")
+    parser.add_argument('--seed', type=int, default=0, help="Seed for the fast generator")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for ingestion")
+    parser.add_argument('--chunksize', type=int, default=None, help="Rows per chunk when reading files")
+    parser.add_argument('--cache-format', default=None, choices=['parquet', 'feather'], help="Columnar cache for ingest")
+    parser.add_argument('--streaming', action='store_true', help="Use the out-of-core ingest path")
+    parser.add_argument('--skip-plots', action='store_true', help="Do not time visualize_data")
+    parser.add_argument('--work-dir', default=None, help="Directory for generated data and outputs (default: temp dir)")
+    parser.add_argument('--label', default='', help="Free-form label stored with the results, e.g. a version")
+    parser.add_argument('--output', default='benchmark_results.jsonl', help="JSON lines file the results are appended to")
+    args = parser.parse_args()
+
+    result = run_benchmark(args)
+    with open(args.output, 'a') as f:
+        f.write(json.dumps(result) + "\n")
+    print(f"Total {result['total_seconds']:.3f}s, results appended to {args.output}")
+
+if __name__ == "__main__":
+    main()
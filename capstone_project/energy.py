@@ -1,36 +1,612 @@
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+import argparse
+import cProfile
+import json
+import platform
+import pstats
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
+from datetime import datetime
 from pathlib import Path
 
+try:
+    # Needed by pandas for the Parquet/Feather cache
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+def rss_high_water_mb(who='self'):
+    # Peak resident memory of this process (or of finished worker processes)
+    if resource is None:
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == 'self' else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in kilobytes on Linux and bytes on macOS
+    divisor = 1024 ** 2 if platform.system() == 'Darwin' else 1024
+    return round(usage.ru_maxrss / divisor, 2)
+
+# Highest tracemalloc peak seen before a per-file reset_peak, so the enclosing stage
+# still reports the true peak
+_traced_peak_floor = 0
+
+@contextmanager
+def file_memory(trace_memory=False):
+    # Memory high-water marks while one meter file is read; runs in the worker process
+    # that reads the file, so the RSS figure is that worker's
+    global _traced_peak_floor
+    record = {}
+    started_tracing = False
+    if trace_memory:
+        if tracemalloc.is_tracing():
+            _traced_peak_floor = max(_traced_peak_floor, tracemalloc.get_traced_memory()[1])
+            tracemalloc.reset_peak()
+        else:
+            tracemalloc.start()
+            started_tracing = True
+    try:
+        yield record
+    finally:
+        if trace_memory:
+            record['traced_peak_mb'] = round(tracemalloc.get_traced_memory()[1] / 1024 ** 2, 2)
+            if started_tracing:
+                tracemalloc.stop()
+        record['rss_high_water_mb'] = rss_high_water_mb()
+
+class PipelineProfiler:
+    def __init__(self, trace_memory=False):
+        self.trace_memory = trace_memory
+        self.stages = []
+        self.files = []
+        self.started = datetime.now()
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        global _traced_peak_floor
+        record = {'stage': name, 'rows': rows}
+        if self.trace_memory:
+            _traced_peak_floor = 0
+            if tracemalloc.is_tracing():
+                tracemalloc.reset_peak()
+            else:
+                tracemalloc.start()
+        start = time.perf_counter()
+        try:
+            # Callers may fill in record['rows'] once they know it
+            yield record
+        finally:
+            elapsed = time.perf_counter() - start
+            record['seconds'] = round(elapsed, 4)
+            if record['rows'] is not None:
+                record['rows_per_second'] = round(record['rows'] / elapsed) if elapsed else None
+            if self.trace_memory:
+                peak = max(_traced_peak_floor, tracemalloc.get_traced_memory()[1])
+                record['traced_peak_mb'] = round(peak / 1024 ** 2, 2)
+            record['rss_high_water_mb'] = rss_high_water_mb()
+            self.stages.append(record)
+
+    def add_files(self, file_timings):
+        for timing in file_timings:
+            record = dict(timing)
+            record['rows_per_second'] = round(timing['rows'] / timing['seconds']) if timing['seconds'] else None
+            self.files.append(record)
+
+    def report(self):
+        return {
+            'started': self.started.isoformat(timespec='seconds'),
+            'total_seconds': round(sum(stage['seconds'] for stage in self.stages), 4),
+            'rss_high_water_mb': rss_high_water_mb(),
+            'worker_rss_high_water_mb': rss_high_water_mb('children'),
+            'stages': self.stages,
+            'files': self.files
+        }
+
+    def write_report(self, path='timing_report.json'):
+        with open(path, 'w') as f:
+            json.dump(self.report(), f, indent=2, default=str)
+
+    def print_summary(self):
+        print(f"{'Stage':<12} {'Seconds':>9} {'Rows':>12} {'Rows/s':>12} {'RSS MB':>9}")
+        for stage in self.stages:
+            rows = f"{stage['rows']:,}" if stage['rows'] is not None else '-'
+            rate = f"{stage['rows_per_second']:,}" if stage.get('rows_per_second') else '-'
+            rss = stage['rss_high_water_mb'] if stage['rss_high_water_mb'] is not None else '-'
+            print(f"{stage['stage']:<12} {stage['seconds']:>9.3f} {rows:>12} {rate:>12} {rss:>9}")
+
+def generate_building_readings(building, date_range, seed=None):
+    np.random.seed(len(building) if seed is None else seed)
+    base_load = np.random.uniform(10, 50)
+    variation = np.random.normal(0, 5, len(date_range))
+    daily_pattern = np.tile(np.sin(np.linspace(0, 3 * np.pi, 24)) * 10 + 10, len(date_range) // 24 + 1)[:len(date_range)]
+    
+    kwh_readings = base_load + daily_pattern + variation
+    kwh_readings = np.maximum(kwh_readings, 0)
+    
+    return pd.DataFrame({
+        'timestamp': date_range,
+        'kwh': kwh_readings
+    })
+
+def write_campus_data(data_dir, buildings, start_date, end_date, freq='H', seeds=None):
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    date_range = pd.date_range(start=start_date, end=end_date, freq=freq)
+    
+    for i, building in enumerate(buildings):
+        df = generate_building_readings(building, date_range, None if seeds is None else seeds[i])
+        
+        # Use pathlib / operator for path joining
+        filename = data_dir / f"{building}_usage.csv"
+        df.to_csv(filename, index=False)
+
+def generate_campus_batch(data_dir, buildings, first_index, start_date, end_date, freq='H', seed=0, file_format='csv'):
+    # One Generator per batch, seeded from (seed, first building index), so the output
+    # only depends on the seed and batch layout, not on which worker writes it
+    rng = np.random.default_rng([seed, first_index])
+    date_range = pd.date_range(start=start_date, end=end_date, freq=freq)
+    n_readings = len(date_range)
+
+    base_load = rng.uniform(10, 50, size=(len(buildings), 1))
+    variation = rng.normal(0, 5, size=(len(buildings), n_readings))
+    pattern = np.sin(np.linspace(0, 3 * np.pi, 24)) * 10 + 10
+    daily_pattern = pattern[np.arange(n_readings) % 24]
+    kwh_readings = np.maximum(base_load + daily_pattern + variation, 0)
+
+    data_dir = Path(data_dir)
+    for building, readings in zip(buildings, kwh_readings):
+        df = pd.DataFrame({'timestamp': date_range, 'kwh': readings})
+        filename = data_dir / f"{building}_usage.{file_format}"
+        if file_format == 'csv':
+            df.to_csv(filename, index=False)
+        else:
+            write_frame(df, filename)
+    return len(buildings)
+
+def generate_synthetic_campus(data_dir, n_buildings, start_date, end_date, freq='H', seed=0,
+                              batch_size=256, workers=1, file_format='csv'):
+    data_dir = Path(data_dir)
+    data_dir.mkdir(parents=True, exist_ok=True)
+    buildings = [f"Building_{i:05d}" for i in range(n_buildings)]
+    batches = [(buildings[i:i + batch_size], i) for i in range(0, n_buildings, batch_size)]
+
+    if workers > 1 and len(batches) > 1:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [
+                pool.submit(generate_campus_batch, data_dir, names, first, start_date, end_date, freq, seed, file_format)
+                for names, first in batches
+            ]
+            for future in futures:
+                future.result()
+    else:
+        for names, first in batches:
+            generate_campus_batch(data_dir, names, first, start_date, end_date, freq, seed, file_format)
+    return buildings
+
 def setup_environment():
     data_dir = Path('data')
     # Use pathlib to check/create directory
     if not data_dir.exists():
-        data_dir.mkdir()
-        
         buildings = ['Science_Block', 'Library', 'Admin_Building', 'Dormitory_A']
-        start_date = '2023-01-01'
-        end_date = '2023-12-31'
-        date_range = pd.date_range(start=start_date, end=end_date, freq='H')
-        
-        for building in buildings:
-            np.random.seed(len(building))
-            base_load = np.random.uniform(10, 50)
-            variation = np.random.normal(0, 5, len(date_range))
-            daily_pattern = np.tile(np.sin(np.linspace(0, 3 * np.pi, 24)) * 10 + 10, len(date_range) // 24 + 1)[:len(date_range)]
-            
-            kwh_readings = base_load + daily_pattern + variation
-            kwh_readings = np.maximum(kwh_readings, 0)
-            
-            df = pd.DataFrame({
-                'timestamp': date_range,
-                'kwh': kwh_readings
-            })
-            
-            # Use pathlib / operator for path joining
-            filename = data_dir / f"{building}_usage.csv"
-            df.to_csv(filename, index=False)
+        write_campus_data(data_dir, buildings, '2023-01-01', '2023-12-31')
+
+METER_SUFFIXES = ('.csv', '.parquet', '.feather')
+
+def list_meter_files(dir_path):
+    # CSV exports plus the binary files written by generate_synthetic_campus
+    return sorted(file for file in Path(dir_path).iterdir() if file.is_file() and file.suffix in METER_SUFFIXES)
+
+def check_meter_columns(file, columns=None):
+    # Check the header first so bad files are reported the same way as before
+    if columns is None:
+        columns = pd.read_csv(file, nrows=0).columns
+    if 'timestamp' not in columns or 'kwh' not in columns:
+        raise ValueError(f"Invalid columns in {file}")
+
+def read_binary_meter_file(file, kwh_dtype='float64'):
+    df = read_frame(file)
+    check_meter_columns(file, df.columns)
+    df = df[['timestamp', 'kwh']]
+    df['kwh'] = df['kwh'].astype(kwh_dtype)
+    return df
+
+def iter_meter_chunks(file, chunksize, kwh_dtype='float64'):
+    file = Path(file)
+    if file.suffix == '.parquet' and HAS_PYARROW:
+        import pyarrow.parquet as pq
+        parquet_file = pq.ParquetFile(file)
+        check_meter_columns(file, parquet_file.schema_arrow.names)
+        for batch in parquet_file.iter_batches(batch_size=chunksize, columns=['timestamp', 'kwh']):
+            chunk = batch.to_pandas()
+            chunk['kwh'] = chunk['kwh'].astype(kwh_dtype)
+            yield chunk
+        return
+    if file.suffix != '.csv':
+        df = read_binary_meter_file(file, kwh_dtype)
+        for start in range(0, len(df), chunksize):
+            yield df.iloc[start:start + chunksize].copy()
+        return
+
+    check_meter_columns(file)
+    # Parse timestamps while reading instead of converting afterwards
+    yield from pd.read_csv(
+        file,
+        chunksize=chunksize,
+        usecols=['timestamp', 'kwh'],
+        dtype={'kwh': kwh_dtype},
+        parse_dates=['timestamp']
+    )
+
+def read_meter_file(file, chunksize=None, kwh_dtype='float64', trace_memory=False):
+    start = time.perf_counter()
+    with file_memory(trace_memory) as memory:
+        if chunksize:
+            df = pd.concat(iter_meter_chunks(file, chunksize, kwh_dtype), ignore_index=True)
+        elif Path(file).suffix != '.csv':
+            df = read_binary_meter_file(file, kwh_dtype)
+        else:
+            check_meter_columns(file)
+            df = pd.read_csv(
+                file,
+                usecols=['timestamp', 'kwh'],
+                dtype={'kwh': kwh_dtype},
+                parse_dates=['timestamp']
+            )
+    return df, time.perf_counter() - start, memory
+
+def aggregate_meter_file(file, chunksize, kwh_dtype='float64', trace_memory=False):
+    # Fold one file into a running aggregate without holding all of its rows
+    start = time.perf_counter()
+    building_name = file.stem.replace('_usage', '')
+    aggregate = BuildingAggregate(building_name)
+    rows = 0
+    with file_memory(trace_memory) as memory:
+        for chunk in iter_meter_chunks(file, chunksize, kwh_dtype):
+            aggregate.merge(BuildingAggregate.from_frame(building_name, chunk.set_index('timestamp')))
+            rows += len(chunk)
+    return aggregate, rows, time.perf_counter() - start, memory
+
+def write_frame(df, path):
+    path = Path(path)
+    if path.suffix == '.parquet':
+        df.to_parquet(path)
+    elif path.suffix == '.feather':
+        # Feather only stores a default index, so keep the timestamps as a column
+        if not isinstance(df.index, pd.RangeIndex):
+            df = df.reset_index()
+        df.to_feather(path)
+    else:
+        df.to_csv(path)
+
+def read_frame(path):
+    path = Path(path)
+    if path.suffix == '.parquet':
+        return pd.read_parquet(path)
+    if path.suffix == '.feather':
+        return pd.read_feather(path)
+    return pd.read_csv(path)
+
+class MeterCache:
+    def __init__(self, cache_dir, file_format='parquet', kwh_dtype='float64'):
+        self.cache_dir = Path(cache_dir)
+        self.file_format = file_format
+        self.kwh_dtype = kwh_dtype
+        self.manifest_path = self.cache_dir / 'manifest.json'
+        self.disabled = False
+        self.manifest = {}
+        if self.manifest_path.exists():
+            try:
+                self.manifest = json.loads(self.manifest_path.read_text())
+            except ValueError:
+                print(f"Warning: ignoring unreadable cache manifest {self.manifest_path}")
+
+    def cache_path(self, file):
+        return self.cache_dir / f"{file.stem}.{self.file_format}"
+
+    def file_key(self, file):
+        stat = file.stat()
+        return {
+            'mtime_ns': stat.st_mtime_ns,
+            'size': stat.st_size,
+            'format': self.file_format,
+            'kwh_dtype': self.kwh_dtype
+        }
+
+    def load(self, file):
+        # A cache entry is only valid while the source file is unchanged
+        if self.manifest.get(file.name) != self.file_key(file):
+            return None
+        path = self.cache_path(file)
+        if not path.exists():
+            return None
+        try:
+            return read_frame(path)
+        except Exception as e:
+            print(f"Warning: could not read cache {path}: {e}")
+            return None
+
+    def store(self, file, df):
+        if self.disabled:
+            return
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            write_frame(df, self.cache_path(file))
+            self.manifest[file.name] = self.file_key(file)
+        except ImportError as e:
+            # Missing pyarrow: warn once and keep going without the cache
+            print(f"Warning: {self.file_format} cache disabled: {e}")
+            self.disabled = True
+        except Exception as e:
+            print(f"Warning: could not cache {file}: {e}")
+
+    def prune(self, files):
+        names = {file.name for file in files}
+        for name in list(self.manifest):
+            if name not in names:
+                del self.manifest[name]
+                stale = self.cache_path(Path(name))
+                if stale.exists():
+                    stale.unlink()
+
+    def save(self):
+        if self.manifest or self.manifest_path.exists():
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            self.manifest_path.write_text(json.dumps(self.manifest, indent=2))
+
+class BuildingAggregate:
+    def __init__(self, name):
+        self.name = name
+        self.total = 0.0
+        self.count = 0
+        self.max_value = np.nan
+        self.max_time = None
+        self.min_value = np.nan
+        self.first_time = None
+        self.last_time = None
+        # kWh sum and reading count per (day, hour) bucket; every other view is derived from these
+        self._bins = pd.DataFrame(
+            {'sum': pd.Series(dtype='float64'), 'count': pd.Series(dtype='int64')},
+            index=pd.MultiIndex.from_arrays([pd.DatetimeIndex([]), pd.Index([], dtype='int32')], names=['day', 'hour'])
+        )
+        # Bins from merged chunks that have not been folded into _bins yet
+        self._pending_bins = []
+        self._pending_rows = 0
+
+    @property
+    def bins(self):
+        if self._pending_bins:
+            self._fold_bins()
+        return self._bins
+
+    def _fold_bins(self):
+        self._bins = pd.concat([self._bins, *self._pending_bins]).groupby(level=['day', 'hour']).sum()
+        self._pending_bins = []
+        self._pending_rows = 0
+
+    @classmethod
+    def from_frame(cls, name, df):
+        agg = cls(name)
+        if df is None or df.empty:
+            return agg
+        timestamps = pd.DatetimeIndex(df.index)
+        kwh = df['kwh'].to_numpy(dtype='float64')
+        agg.first_time = timestamps.min()
+        agg.last_time = timestamps.max()
+
+        valid = ~np.isnan(kwh)
+        if not valid.all():
+            kwh = kwh[valid]
+            timestamps = timestamps[valid]
+        if len(kwh) == 0:
+            return agg
+
+        agg.total = float(kwh.sum())
+        agg.count = len(kwh)
+        peak = int(kwh.argmax())
+        agg.max_value = float(kwh[peak])
+        agg.max_time = timestamps[peak]
+        agg.min_value = float(kwh.min())
+
+        agg._bins = pd.DataFrame({
+            'day': timestamps.normalize(),
+            'hour': timestamps.hour.astype('int32'),
+            'kwh': kwh
+        }).groupby(['day', 'hour'])['kwh'].agg(['sum', 'count'])
+        return agg
+
+    def merge(self, other):
+        if other.first_time is not None:
+            self.first_time = other.first_time if self.first_time is None else min(self.first_time, other.first_time)
+            self.last_time = other.last_time if self.last_time is None else max(self.last_time, other.last_time)
+        if other.count == 0:
+            return self
+        if self.count == 0 or other.max_value > self.max_value:
+            self.max_value = other.max_value
+            self.max_time = other.max_time
+        self.min_value = other.min_value if self.count == 0 else min(self.min_value, other.min_value)
+        self.total += other.total
+        self.count += other.count
+        # Scalars are updated right away; bins are folded lazily once the pending
+        # rows outgrow the folded table, so a merge costs time proportional to the new data
+        self._pending_bins.append(other.bins)
+        self._pending_rows += len(other.bins)
+        if self._pending_rows > max(len(self._bins), 1024):
+            self._fold_bins()
+        return self
+
+    def day_count(self):
+        if self.first_time is None:
+            return 0
+        return (self.last_time.normalize() - self.first_time.normalize()).days + 1
+
+    def get_daily_totals(self):
+        daily = self.bins.groupby(level='day')['sum'].sum()
+        if self.first_time is None:
+            return daily
+        days = pd.date_range(self.first_time.normalize(), self.last_time.normalize(), freq='D')
+        return daily.reindex(days, fill_value=0.0)
+
+    def get_weekly_average(self):
+        daily = self.bins.groupby(level='day')[['sum', 'count']].sum()
+        if daily.empty:
+            return pd.Series(dtype='float64')
+        # Label each day with the Sunday that ends its week, like resample('W')
+        week_end = daily.index + pd.to_timedelta(6 - daily.index.dayofweek, unit='D')
+        weekly = daily.groupby(week_end).sum()
+        weeks = pd.date_range(weekly.index.min(), weekly.index.max(), freq='W')
+        weekly = weekly.reindex(weeks)
+        return weekly['sum'] / weekly['count'].where(weekly['count'] > 0)
+
+    def get_hourly_profile(self):
+        hourly = self.bins.groupby(level='hour')[['sum', 'count']].sum()
+        return hourly['sum'] / hourly['count']
+
+    def get_summary_stats(self):
+        days = self.day_count()
+        return {
+            'Building': self.name,
+            'Total_kWh': self.total,
+            'Mean_Daily_kWh': self.total / days if days else np.nan,
+            'Max_Reading': self.max_value,
+            'Min_Reading': self.min_value
+        }
+
+class CampusAggregates:
+    def __init__(self, aggregates):
+        self.aggregates = aggregates
+        self._results = {}
+
+    def update(self, name, aggregate):
+        self.aggregates[name] = aggregate
+        self._results = {}
+
+    def _memo(self, key, compute):
+        if key not in self._results:
+            self._results[key] = compute()
+        return self._results[key]
+
+    def summary_df(self):
+        return self._memo('summary', lambda: pd.DataFrame(
+            [agg.get_summary_stats() for agg in self.aggregates.values()]
+        ))
+
+    def total(self):
+        return sum(agg.total for agg in self.aggregates.values())
+
+    def peak(self):
+        # (value, timestamp, building) of the highest single reading on campus
+        def compute():
+            candidates = [agg for agg in self.aggregates.values() if agg.count]
+            if not candidates:
+                return np.nan, None, None
+            best = max(candidates, key=lambda agg: agg.max_value)
+            return best.max_value, best.max_time, best.name
+        return self._memo('peak', compute)
+
+    def daily_totals(self):
+        return self._memo('daily', lambda: self._combine(lambda agg: agg.get_daily_totals()))
+
+    def weekly_averages(self):
+        return self._memo('weekly', lambda: self._combine(lambda agg: agg.get_weekly_average()))
+
+    def hourly_profile(self):
+        return self._memo('hourly', lambda: self._combine(lambda agg: agg.get_hourly_profile()))
+
+    def _combine(self, view):
+        frame = pd.concat({name: view(agg) for name, agg in self.aggregates.items()}, axis=1)
+        frame.columns.name = 'Building'
+        return frame
+
+def decimate_minmax_indices(y, max_points):
+    # Keep the min and max of each bucket so spikes survive downsampling
+    y = np.asarray(y, dtype='float64')
+    n_buckets = max_points // 2
+    if len(y) <= max_points or n_buckets < 1:
+        return np.arange(len(y))
+    bucket_size = int(np.ceil(len(y) / n_buckets))
+    padded = np.full(n_buckets * bucket_size, np.nan)
+    padded[:len(y)] = y
+    buckets = padded.reshape(n_buckets, bucket_size)
+    valid = ~np.isnan(buckets).all(axis=1)
+    offsets = np.arange(n_buckets) * bucket_size
+    low = offsets + np.where(np.isnan(buckets), np.inf, buckets).argmin(axis=1)
+    high = offsets + np.where(np.isnan(buckets), -np.inf, buckets).argmax(axis=1)
+    return np.unique(np.concatenate([low[valid], high[valid]]))
+
+def decimate_minmax(x, y, max_points):
+    keep = decimate_minmax_indices(y, max_points)
+    return np.asarray(x)[keep], np.asarray(y, dtype='float64')[keep]
+
+def render_building_panel(name, daily, hourly, path, max_points=1000):
+    # Works from pre-aggregated series only, so it can run in a worker process
+    fig = Figure(figsize=(10, 4))
+    FigureCanvasAgg(fig)
+    ax1, ax2 = fig.subplots(1, 2, gridspec_kw={'width_ratios': [3, 1]})
+
+    x, y = decimate_minmax(daily.index.to_numpy(), daily.to_numpy(), max_points)
+    ax1.plot(x, y, color='tab:blue', linewidth=0.8)
+    ax1.set_title(f'{name}: Daily Energy Consumption')
+    ax1.set_ylabel('Total kWh')
+
+    ax2.bar(hourly.index, hourly.to_numpy(), color='skyblue', edgecolor='black', linewidth=0.3)
+    ax2.set_title('Average by Hour of Day')
+    ax2.set_xlabel('Hour of Day')
+
+    fig.tight_layout()
+    fig.savefig(path)
+    return str(path)
+
+def render_campus_overview(aggregates, path, max_points=2000, top_n=20):
+    fig = Figure(figsize=(15, 10))
+    FigureCanvasAgg(fig)
+    grid = fig.add_gridspec(2, 2)
+
+    # Campus total with the spread across buildings instead of one line per building
+    daily = aggregates.daily_totals()
+    ax1 = fig.add_subplot(grid[0, :])
+    total = daily.sum(axis=1).to_numpy()
+    keep = decimate_minmax_indices(total, max_points)
+    x = daily.index.to_numpy()[keep]
+    ax1.fill_between(
+        x, daily.min(axis=1).to_numpy()[keep], daily.max(axis=1).to_numpy()[keep],
+        color='tab:blue', alpha=0.2, label='Building min-max'
+    )
+    ax1.plot(x, total[keep], color='tab:red', linewidth=0.8, label='Campus total')
+    ax1.set_title('Daily Energy Consumption Trend')
+    ax1.set_ylabel('Total kWh')
+    ax1.legend(loc='upper right')
+
+    ax2 = fig.add_subplot(grid[1, 0])
+    weekly_avg = aggregates.weekly_averages().mean().sort_values(ascending=False).head(top_n)
+    ax2.bar(weekly_avg.index.astype(str), weekly_avg.to_numpy(), color='skyblue', edgecolor='black')
+    ax2.set_title(f'Average Weekly Usage (top {len(weekly_avg)} buildings)')
+    ax2.set_ylabel('Average kWh')
+    ax2.tick_params(axis='x', rotation=45)
+
+    # A heatmap stays readable with hundreds of buildings where a scatter does not
+    ax3 = fig.add_subplot(grid[1, 1])
+    hourly = aggregates.hourly_profile()
+    image = ax3.imshow(hourly.T.to_numpy(), aspect='auto', cmap='viridis', interpolation='nearest')
+    ax3.set_title('Average Consumption by Hour of Day')
+    ax3.set_xlabel('Hour of Day')
+    ax3.set_ylabel('Building')
+    if hourly.shape[1] <= 30:
+        ax3.set_yticks(range(hourly.shape[1]))
+        ax3.set_yticklabels(hourly.columns)
+    fig.colorbar(image, ax=ax3, label='Average kWh')
+
+    fig.tight_layout()
+    fig.savefig(path)
+    return str(path)
 
 class MeterReading:
     def __init__(self, timestamp, kwh):
@@ -42,79 +618,320 @@ class Building:
         self.name = name
         self.readings = []
         self.df = None
+        self.aggregate = None
 
     def add_readings_from_df(self, df):
         self.df = df
         self.df['timestamp'] = pd.to_datetime(self.df['timestamp'])
         self.df.set_index('timestamp', inplace=True)
         self.df['Building'] = self.name
+        self.aggregate = None
+
+    def append_readings(self, df, kwh_dtype='float64', keep_rows=True):
+        new = df[['timestamp', 'kwh']].copy()
+        new['timestamp'] = pd.to_datetime(new['timestamp'])
+        new['kwh'] = new['kwh'].astype(kwh_dtype)
+        new.set_index('timestamp', inplace=True)
+
+        # Only the new rows are reduced, then merged into the running aggregate
+        new_aggregate = BuildingAggregate.from_frame(self.name, new)
+        # _df and pending_frames are used directly: the df property would concatenate
+        # the whole history on every append
+        if self.aggregate is None and self._df is None:
+            self.aggregate = new_aggregate
+        else:
+            self.get_aggregate().merge(new_aggregate)
+
+        if not keep_rows:
+            return new_aggregate
+        if self._df is None:
+            new['Building'] = self.name
+            self.df = new
+        else:
+            new['Building'] = pd.Series(self.name, index=new.index, dtype=self._df['Building'].dtype)
+            self.pending_frames.append(new)
+        return new_aggregate
+
+    @property
+    def df(self):
+        # Appended rows are concatenated only when the raw frame is actually needed
+        if self.pending_frames:
+            self._df = pd.concat([self._df, *self.pending_frames])
+            self.pending_frames = []
+        return self._df
+
+    @df.setter
+    def df(self, df):
+        self._df = df
+        self.pending_frames = []
+
+    def get_aggregate(self):
+        # Computed once per building and shared by the summary, report and dashboard
+        if self.aggregate is None:
+            self.aggregate = BuildingAggregate.from_frame(self.name, self.df)
+        return self.aggregate
+
+    def kwh_array(self):
+        # Each building keeps its readings in one contiguous column
+        return self.df['kwh'].to_numpy()
 
     def get_daily_totals(self):
-        return self.df['kwh'].resample('D').sum()
+        return self.get_aggregate().get_daily_totals()
 
     def get_weekly_average(self):
-        return self.df['kwh'].resample('W').mean()
+        return self.get_aggregate().get_weekly_average()
 
     def get_summary_stats(self):
-        return {
-            'Building': self.name,
-            'Total_kWh': self.df['kwh'].sum(),
-            'Mean_Daily_kWh': self.get_daily_totals().mean(),
-            'Max_Reading': self.df['kwh'].max(),
-            'Min_Reading': self.df['kwh'].min()
-        }
+        return self.get_aggregate().get_summary_stats()
 
 class BuildingManager:
-    def __init__(self):
+    def __init__(self, compact=False, float32=False, keep_combined=True):
         self.buildings = {}
         self.combined_df = pd.DataFrame()
+        self.file_timings = []
+        self._aggregates = None
+        # Memory options: categorical building IDs, float32 readings and
+        # per-building frames only (combined_df is then built on demand)
+        self.compact = compact
+        self.kwh_dtype = 'float32' if float32 else 'float64'
+        self.keep_combined = keep_combined
+        # Set by ingest_streaming: source file per building, re-read in chunks on export
+        self.stream_files = {}
+        self.stream_chunksize = None
+
+    @property
+    def combined_df(self):
+        if self._combined_df is None:
+            frames = [b.df for b in self.buildings.values() if b.df is not None]
+            combined = pd.concat(frames) if frames else pd.DataFrame()
+            if self.keep_combined and frames:
+                self._combined_df = combined
+            return combined
+        return self._combined_df
 
-    def ingest_data(self, directory_path):
+    @combined_df.setter
+    def combined_df(self, df):
+        self._combined_df = df
+
+    @property
+    def aggregates(self):
+        if self._aggregates is None:
+            self._aggregates = CampusAggregates(
+                {name: building.get_aggregate() for name, building in self.buildings.items()}
+            )
+        return self._aggregates
+
+    def ingest_data(self, directory_path, workers=1, chunksize=None, cache_format=None, trace_memory=False):
         # Use pathlib to create a Path object
         dir_path = Path(directory_path)
         # Use glob to find all csv files
-        files = list(dir_path.glob('*.csv'))
-        
-        all_data = []
+        files = list_meter_files(dir_path)
         
+        loaded = []
+        self.file_timings = []
+        self._aggregates = None
+        self.stream_files = {}
+
+        # Only files that changed since the last run are parsed again
+        cache = MeterCache(dir_path / '.cache', cache_format, self.kwh_dtype) if cache_format else None
+        to_read = []
+        cached_files = set()
         for file in files:
+            start = time.perf_counter()
+            # Binary meter files are already columnar and are not cached again
+            df = cache.load(file) if cache and file.suffix == '.csv' else None
+            if df is None:
+                to_read.append(file)
+            else:
+                loaded.append((file, (df, time.perf_counter() - start, {'rss_high_water_mb': rss_high_water_mb()})))
+                cached_files.add(file)
+
+        parsed = []
+        if workers > 1 and len(to_read) > 1:
+            # Read the files concurrently, each worker returns a parsed frame
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(read_meter_file, file, chunksize, self.kwh_dtype, trace_memory) for file in to_read]
+                for file, future in zip(to_read, futures):
+                    try:
+                        parsed.append((file, future.result()))
+                    except Exception as e:
+                        print(f"Error processing {file}: {e}")
+        else:
+            for file in to_read:
+                try:
+                    parsed.append((file, read_meter_file(file, chunksize, self.kwh_dtype, trace_memory)))
+                except Exception as e:
+                    print(f"Error processing {file}: {e}")
+
+        if cache:
+            for file, (df, elapsed, memory) in parsed:
+                if file.suffix == '.csv':
+                    cache.store(file, df)
+            cache.prune(files)
+            cache.save()
+        loaded.extend(parsed)
+        loaded.sort(key=lambda item: item[0])
+
+        for file, (df, elapsed, memory) in loaded:
             try:
                 # Extract filename without extension using .stem
                 building_name = file.stem.replace('_usage', '')
-                # Read directly from the Path object
-                df = pd.read_csv(file)
-                
-                if 'timestamp' not in df.columns or 'kwh' not in df.columns:
-                    raise ValueError(f"Invalid columns in {file}")
-
+                if df['kwh'].dtype != self.kwh_dtype:
+                    df['kwh'] = df['kwh'].astype(self.kwh_dtype)
                 building = Building(building_name)
                 building.add_readings_from_df(df)
                 self.buildings[building_name] = building
-                all_data.append(building.df)
+                from_cache = file in cached_files
+                self.file_timings.append({'file': file.name, 'rows': len(df), 'seconds': elapsed, 'cached': from_cache,
+                                          **memory})
+                source = " (cached)" if from_cache else ""
+                print(f"Loaded {file.name}: {len(df):,} rows in {elapsed:.3f}s{source}")
                 
             except Exception as e:
                 print(f"Error processing {file}: {e}")
 
-        if all_data:
-            self.combined_df = pd.concat(all_data)
+        if not self.buildings:
+            raise FileNotFoundError("No valid data found to process.")
+
+        if self.compact:
+            self.encode_building_ids()
+        if self.keep_combined:
+            self.combined_df = pd.concat([b.df for b in self.buildings.values()])
         else:
+            self.combined_df = None
+
+    def ingest_streaming(self, directory_path, chunksize=500_000, workers=1, trace_memory=False):
+        # Out-of-core mode: only the per-building aggregates are kept in memory
+        dir_path = Path(directory_path)
+        files = list_meter_files(dir_path)
+
+        self.buildings = {}
+        self.combined_df = pd.DataFrame()
+        self.file_timings = []
+        self._aggregates = None
+        self.stream_files = {}
+        self.stream_chunksize = chunksize
+
+        results = []
+        if workers > 1 and len(files) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(aggregate_meter_file, file, chunksize, self.kwh_dtype, trace_memory)
+                           for file in files]
+                for file, future in zip(files, futures):
+                    try:
+                        results.append((file, future.result()))
+                    except Exception as e:
+                        print(f"Error processing {file}: {e}")
+        else:
+            for file in files:
+                try:
+                    results.append((file, aggregate_meter_file(file, chunksize, self.kwh_dtype, trace_memory)))
+                except Exception as e:
+                    print(f"Error processing {file}: {e}")
+
+        for file, (aggregate, rows, elapsed, memory) in results:
+            building = Building(aggregate.name)
+            building.aggregate = aggregate
+            self.buildings[aggregate.name] = building
+            self.stream_files[aggregate.name] = file
+            self.file_timings.append({'file': file.name, 'rows': rows, 'seconds': elapsed, 'cached': False, **memory})
+            print(f"Streamed {file.name}: {rows:,} rows in {elapsed:.3f}s")
+
+        if not self.buildings:
             raise FileNotFoundError("No valid data found to process.")
 
-    def export_data(self):
-        self.combined_df.to_csv('cleaned_energy_data.csv')
+    def export_streamed(self, path):
+        # Rewrite the cleaned data chunk by chunk, in the same layout as combined_df.to_csv
+        with open(path, 'w', newline='') as f:
+            header = True
+            for name, file in self.stream_files.items():
+                for chunk in iter_meter_chunks(file, self.stream_chunksize, self.kwh_dtype):
+                    chunk = chunk.set_index('timestamp')
+                    chunk['Building'] = name
+                    chunk.to_csv(f, header=header)
+                    header = False
+
+    def append_readings(self, building_name, df):
+        building = self.buildings.get(building_name)
+        is_new = building is None
+        if is_new:
+            building = Building(building_name)
+            self.buildings[building_name] = building
+        # In streaming mode only the aggregates are kept, not the raw rows
+        building.append_readings(df, self.kwh_dtype, keep_rows=not self.stream_files)
+        if is_new and self.compact and building._df is not None:
+            self.encode_building_ids()
+
+        # The combined frame is rebuilt lazily (including the empty one a new manager
+        # starts with); the campus views only drop their memos
+        self._combined_df = None
+        if self._aggregates is not None:
+            self._aggregates.update(building_name, building.get_aggregate())
+
+    def write_summaries(self):
+        # Re-emit building_summary.csv and summary.txt from the running aggregates
+        summary_df = self.aggregates.summary_df()
+        summary_df.to_csv('building_summary.csv', index=False)
+        self.generate_report(summary_df)
+        return summary_df
+
+    def encode_building_ids(self):
+        # Store the Building column as small integer codes sharing one category list
+        building_dtype = pd.CategoricalDtype(sorted(self.buildings))
+        for code, name in enumerate(building_dtype.categories):
+            df = self.buildings[name].df
+            codes = np.full(len(df), code, dtype=np.int32)
+            df['Building'] = pd.Categorical.from_codes(codes, dtype=building_dtype)
+
+    def memory_report(self):
+        rows = []
+        for building in self.buildings.values():
+            if building.df is None:
+                continue
+            usage = building.df.memory_usage(deep=True)
+            rows.append({
+                'Frame': building.name,
+                'Rows': len(building.df),
+                'Index_Bytes': usage['Index'],
+                'kWh_Bytes': usage['kwh'],
+                'Building_Bytes': usage['Building'],
+                'Total_Bytes': usage.sum()
+            })
+        if self._combined_df is not None and not self._combined_df.empty:
+            usage = self._combined_df.memory_usage(deep=True)
+            rows.append({
+                'Frame': 'combined_df',
+                'Rows': len(self._combined_df),
+                'Index_Bytes': usage['Index'],
+                'kWh_Bytes': usage['kwh'],
+                'Building_Bytes': usage['Building'],
+                'Total_Bytes': usage.sum()
+            })
+        report = pd.DataFrame(rows)
+        if not report.empty:
+            total = report.drop(columns='Frame').sum()
+            # combined_df repeats the buildings' readings: its bytes count, its rows do not
+            total['Rows'] = report.loc[report['Frame'] != 'combined_df', 'Rows'].sum()
+            report.loc[len(report)] = {'Frame': 'TOTAL', **total.to_dict()}
+        return report
+
+    def export_data(self, file_format='csv'):
+        if self.stream_files:
+            if file_format != 'csv':
+                raise ValueError("Streaming mode can only export the cleaned data as csv")
+            self.export_streamed('cleaned_energy_data.csv')
+        else:
+            write_frame(self.combined_df, f'cleaned_energy_data.{file_format}')
         
-        summary_list = [b.get_summary_stats() for b in self.buildings.values()]
-        summary_df = pd.DataFrame(summary_list)
+        summary_df = self.aggregates.summary_df()
         summary_df.to_csv('building_summary.csv', index=False)
         return summary_df
 
     def generate_report(self, summary_df):
-        total_consumption = self.combined_df['kwh'].sum()
+        total_consumption = self.aggregates.total()
         highest_consumer = summary_df.loc[summary_df['Total_kWh'].idxmax()]
         
-        peak_time = self.combined_df['kwh'].idxmax()
-        peak_value = self.combined_df['kwh'].max()
-        peak_building = self.combined_df.loc[peak_time, 'Building']
+        peak_value, peak_time, peak_building = self.aggregates.peak()
 
         with open('summary.txt', 'w') as f:
             f.write("CAMPUS ENERGY CONSUMPTION REPORT\n")
@@ -136,7 +953,7 @@ class BuildingManager:
         axes[0, 1].remove()
         ax1 = fig.add_subplot(2, 1, 1)
 
-        daily_totals = self.combined_df.groupby([pd.Grouper(freq='D'), 'Building'])['kwh'].sum().unstack()
+        daily_totals = self.aggregates.daily_totals()
         daily_totals.plot(ax=ax1, alpha=0.7)
         ax1.set_title('Daily Energy Consumption Trend')
         ax1.set_ylabel('Total kWh')
@@ -144,7 +961,7 @@ class BuildingManager:
 
         # Bottom Left: Bar Chart
         ax2 = fig.add_subplot(2, 2, 3)
-        weekly_avg = self.combined_df.groupby('Building')['kwh'].resample('W').mean().groupby('Building').mean()
+        weekly_avg = self.aggregates.weekly_averages().mean()
         weekly_avg.plot(kind='bar', ax=ax2, color='skyblue', edgecolor='black')
         ax2.set_title('Average Weekly Usage per Building')
         ax2.set_ylabel('Average kWh')
@@ -152,7 +969,7 @@ class BuildingManager:
 
         # Bottom Right: Scatter Plot
         ax3 = fig.add_subplot(2, 2, 4)
-        daily_max = self.combined_df.groupby([self.combined_df.index.hour, 'Building'])['kwh'].mean().unstack()
+        daily_max = self.aggregates.hourly_profile()
         for column in daily_max.columns:
             ax3.scatter(daily_max.index, daily_max[column], label=column, alpha=0.6)
         ax3.set_title('Average Peak Hour Consumption')
@@ -164,15 +981,83 @@ class BuildingManager:
         plt.savefig('dashboard.png')
         plt.close()
 
-def main():
-    setup_environment()
+    def render_dashboard(self, output_dir='dashboard', max_points=2000, workers=1, per_building=True):
+        # Fast path: renders from the shared aggregates with the Agg canvas, never from raw rows
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        paths = [render_campus_overview(self.aggregates, output_dir / 'overview.png', max_points)]
+        if not per_building:
+            return paths
+
+        daily = self.aggregates.daily_totals()
+        hourly = self.aggregates.hourly_profile()
+        jobs = [
+            (name, daily[name].dropna(), hourly[name], output_dir / f'{name}.png', max_points // 2)
+            for name in self.aggregates.aggregates
+        ]
+        if workers > 1 and len(jobs) > 1:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [pool.submit(render_building_panel, *job) for job in jobs]
+                paths.extend(future.result() for future in futures)
+        else:
+            paths.extend(render_building_panel(*job) for job in jobs)
+        return paths
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Campus energy-use dashboard.")
+    parser.add_argument('--data-dir', default='data', help="Directory with *_usage.csv meter files")
+    parser.add_argument('--workers', type=int, default=1, help="Worker processes for ingestion and rendering")
+    parser.add_argument('--chunksize', type=int, default=None, help="Rows per chunk when reading files")
+    parser.add_argument('--cache-format', default='parquet' if HAS_PYARROW else 'none',
+                        choices=['parquet', 'feather', 'none'], help="Columnar cache for ingest")
+    parser.add_argument('--streaming', action='store_true', help="Out-of-core mode, keeps only aggregates in memory")
+    parser.add_argument('--fast-dashboard', action='store_true', help="Render the pre-aggregated dashboard into dashboard/")
+    parser.add_argument('--trace-memory', action='store_true', help="Record tracemalloc peaks per stage (slower)")
+    parser.add_argument('--timing-report', default='timing_report.json', help="Where to write the stage timing report")
+    parser.add_argument('--profile', nargs='?', const='energy.prof', default=None,
+                        help="Run under cProfile and save the stats (default file: energy.prof)")
+    return parser.parse_args(argv)
+
+def run_pipeline(args, profiler):
+    with profiler.stage('setup'):
+        setup_environment()
     
     manager = BuildingManager()
-    manager.ingest_data('data')
+    with profiler.stage('ingest') as record:
+        if args.streaming:
+            manager.ingest_streaming(args.data_dir, args.chunksize or 500_000, args.workers, profiler.trace_memory)
+        else:
+            cache_format = None if args.cache_format == 'none' else args.cache_format
+            manager.ingest_data(args.data_dir, args.workers, args.chunksize, cache_format, profiler.trace_memory)
+        record['rows'] = sum(timing['rows'] for timing in manager.file_timings)
+    profiler.add_files(manager.file_timings)
+    rows = profiler.stages[-1]['rows']
     
-    summary_df = manager.export_data()
-    manager.generate_report(summary_df)
-    manager.visualize_data()
+    with profiler.stage('export', rows):
+        summary_df = manager.export_data()
+    with profiler.stage('report'):
+        manager.generate_report(summary_df)
+    with profiler.stage('visualize'):
+        if args.fast_dashboard:
+            manager.render_dashboard(workers=args.workers)
+        else:
+            manager.visualize_data()
+
+def main(argv=None):
+    args = parse_args(argv)
+    profiler = PipelineProfiler(trace_memory=args.trace_memory)
+
+    if args.profile:
+        profile = cProfile.Profile()
+        profile.runcall(run_pipeline, args, profiler)
+        profile.dump_stats(args.profile)
+        pstats.Stats(profile).sort_stats('cumulative').print_stats(20)
+    else:
+        run_pipeline(args, profiler)
+
+    # Written next to summary.txt so slow runs can be diagnosed afterwards
+    profiler.write_report(args.timing_report)
+    profiler.print_summary()
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
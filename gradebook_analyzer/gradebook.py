@@ -1,146 +1,489 @@
-ch=input("do you want to continue? (yes/no): ").lower() #TASK6:TO RUN THE LOOP TO ASK FOR PERMISSION:
-while ch=="yes":   
-    def calculate_average(marks_dict):#TASK3:AVERAGE CALCULATION
-        len_dict = len(marks_dict)
-        if len_dict == 0:
-            return 0
-        else:
-            total_marks = sum(marks_dict.values())
-            average = total_marks / len_dict
-            return average
-        
-    def calculate_median(marks_dict):#TASK3:MEDIAN CALCULATION
-        marks_list = sorted(marks_dict.values())
-        len_list = len(marks_list)
-        if len_list == 0:
-            return 0
+import argparse
+import csv
+import json
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+#ANALYTICS ENGINE:MARKS ARE KEPT IN A NUMPY ARRAY AND GRADED IN ONE VECTORIZED PASS
+GRADE_CUTOFFS = np.array([60, 70, 80, 90])
+GRADE_LETTERS = np.array(['F', 'D', 'C', 'B', 'A'])
+PASS_MARK = 40
+
+def marks_to_arrays(marks_dict):#ENGINE:NAMES AND MARKS AS PARALLEL ARRAYS
+    names = np.array(list(marks_dict.keys()), dtype=object)
+    marks = np.array(list(marks_dict.values()))
+    return names, marks
+
+def analyze_marks(names, marks):#ENGINE:ALL STATISTICS FOR ONE COHORT
+    names = np.asarray(names, dtype=object)
+    marks = np.asarray(marks)
+    if marks.size == 0:
+        return {'count': 0, 'average': 0, 'median': 0, 'max_student': None, 'max_score': None,
+                'min_student': None, 'min_score': None, 'grades': GRADE_LETTERS[:0],
+                'distribution': {letter: 0 for letter in GRADE_LETTERS[::-1]}, 'passed': marks >= PASS_MARK}
+
+    # np.digitize maps each mark to its grade band: <60 -> 0 (F) ... >=90 -> 4 (A)
+    grade_index = np.digitize(marks, GRADE_CUTOFFS)
+    grade_counts = np.bincount(grade_index, minlength=len(GRADE_LETTERS))
+    # argmax/argmin return the first student with the extreme mark, like the dict scans
+    max_index = int(np.argmax(marks))
+    min_index = int(np.argmin(marks))
+    return {
+        'count': int(marks.size),
+        'average': float(marks.mean()),
+        'median': float(np.median(marks)),
+        'max_student': names[max_index],
+        'max_score': marks[max_index].item(),
+        'min_student': names[min_index],
+        'min_score': marks[min_index].item(),
+        'grades': GRADE_LETTERS[grade_index],
+        'distribution': {letter: int(grade_counts[i]) for i, letter in reversed(list(enumerate(GRADE_LETTERS)))},
+        'passed': marks >= PASS_MARK
+    }
+
+#TASK 3-5:marks_dict HELPERS, THIN WRAPPERS OVER THE ANALYTICS ENGINE SO THE GRADING RULES LIVE IN ONE PLACE
+def analyze_marks_dict(marks_dict):
+    return analyze_marks(*marks_to_arrays(marks_dict))
+
+def calculate_average(marks_dict):#TASK3:AVERAGE CALCULATION
+    return analyze_marks_dict(marks_dict)['average']
+
+def calculate_median(marks_dict):#TASK3:MEDIAN CALCULATION
+    return analyze_marks_dict(marks_dict)['median']
+
+def find_max_score(marks_dict):#TASK3:MAXIMUM SCORE FINDING
+    if marks_dict:
+        stats = analyze_marks_dict(marks_dict)
+        return stats['max_student'], stats['max_score']
+
+def find_min_score(marks_dict):#TASK3:MINIMUM SCORE FINDING
+    if marks_dict:
+        stats = analyze_marks_dict(marks_dict)
+        return stats['min_student'], stats['min_score']
+
+#TASK 4:GRADE ASSIGNMENT AND DISTRIBUTION
+def print_gradebook(marks_dict):
+    print("Gradebook:")
+    names, marks = marks_to_arrays(marks_dict)
+    grades = np.char.lower(analyze_marks(names, marks)['grades'].astype(str))
+    return dict(zip(names.tolist(), grades.tolist()))
+
+def grade_distribution(marks_dict):
+    return analyze_marks_dict(marks_dict)['distribution']
+
+#TASK 5:PASS OR FAIL DETERMINATION
+def pass_or_fail(marks_dict):
+    names, marks = marks_to_arrays(marks_dict)
+    passed_mask = analyze_marks(names, marks)['passed']
+    passed = names[passed_mask].tolist()
+    failed = names[~passed_mask].tolist()
+    results = dict(zip(names.tolist(), np.where(passed_mask, 'Pass', 'Fail').tolist()))
+    return passed, len(passed), failed, len(failed), results
+
+#REPORT RENDERER:THE WHOLE TABLE IS BUILT IN MEMORY AND WRITTEN IN ONE GO
+# Set fixed column widths for consistent spacing
+NAME_WIDTH = 15
+MARKS_WIDTH = 8
+GRADE_WIDTH = 8
+RESULT_WIDTH = 6
+
+def as_list(values):
+    # NumPy arrays are converted once so the rows below format plain Python values
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
+
+def render_results_table(names, marks, grades, results=None):#REPORT RENDERER:TEXT TABLE IN LINEAR TIME
+    names, marks, grades = as_list(names), as_list(marks), as_list(grades)
+    # Header Row (Left-align Name, Right-align Marks and Grade)
+    header = f"{'Name':<{NAME_WIDTH}} | {'Marks':>{MARKS_WIDTH}} | {'Grade':>{GRADE_WIDTH}}"
+    width = NAME_WIDTH + MARKS_WIDTH + GRADE_WIDTH + 6 # +6 for the spaces
+    if results is None:
+        rows = [f"{name:<{NAME_WIDTH}} | {mark:>{MARKS_WIDTH}} | {grade:>{GRADE_WIDTH}}"
+                for name, mark, grade in zip(names, marks, grades)]
+    else:
+        header += f" | {'Result':>{RESULT_WIDTH}}"
+        width += RESULT_WIDTH + 3
+        rows = [f"{name:<{NAME_WIDTH}} | {mark:>{MARKS_WIDTH}} | {grade:>{GRADE_WIDTH}} | {result:>{RESULT_WIDTH}}"
+                for name, mark, grade, result in zip(names, marks, grades, as_list(results))]
+    return "\n".join([header, "-" * width, *rows, ""]) + "\n"
+
+def write_results_table(path, names, marks, grades, results=None):#REPORT RENDERER:.csv FILES AS CSV, ANYTHING ELSE AS THE TEXT TABLE
+    with open(path, 'w', newline='') as f:
+        if path.endswith('.csv'):
+            writer = csv.writer(f)
+            columns = [as_list(names), as_list(marks), as_list(grades)]
+            if results is not None:
+                columns.append(as_list(results))
+            writer.writerow(['Name', 'Marks', 'Grade', 'Result'][:len(columns)])
+            writer.writerows(zip(*columns))
         else:
-            mid = len_list // 2
-            if len_list % 2 == 0:
-                median = (marks_list[mid - 1] + marks_list[mid]) / 2
-            else:
-                median = marks_list[mid]
-            return median
+            f.write(render_results_table(names, marks, grades, results))
+
+def page_text(text, page_size=40, output=sys.stdout):#REPORT RENDERER:PAGINATED TERMINAL OUTPUT
+    lines = text.splitlines(keepends=True)
+    for start in range(0, len(lines), page_size):
+        output.write("".join(lines[start:start + page_size]))
+        output.flush()
+        if start + page_size < len(lines):
+            if input("-- More (Enter to continue, q to quit) --").strip().lower() == 'q':
+                break
+
+#PRINT RESULTS IN TABLE FORMAT
+def print_results_table(marks_dict, grade_dist, page_size=None):
+    names = list(marks_dict.keys())
+    table = render_results_table(names, marks_dict.values(), [grade_dist[name] for name in names])
+    if page_size:
+        page_text(table, page_size)
+    else:
+        sys.stdout.write(table)
         
-    def find_max_score(marks_dict):#TASK3:MAXIMUM SCORE FINDING
-        for student, score in marks_dict.items():
-            if score == max(marks_dict.values()):
-                return student, score
-            
-    def find_min_score(marks_dict):#TASK3:MINIMUM SCORE FINDING
-        for student, score in marks_dict.items():
-            if score == min(marks_dict.values()):
-                return student, score
-            
-    #TASK 4:GRADE ASSIGNMENT AND DISTRIBUTION
-    def print_gradebook(marks_dict):
-        print("Gradebook:")
-        grade_distribution={}
-        for key,value in marks_dict.items():
-            if value >= 90:
-                grade="a"
-                grade_distribution[key]=grade
-            elif value >= 80:
-                grade="b"
-                grade_distribution[key]=grade
-            elif value >= 70:
-                grade="c"
-                grade_distribution[key]=grade
-            elif value >= 60:
-                grade="d"
-                grade_distribution[key]=grade
-            else:
-                grade="f"
-                grade_distribution[key]=grade
-        return grade_distribution
-
-    def grade_distribution(marks_dict):
-        distribution = {'A': 0, 'B': 0, 'C': 0, 'D': 0, 'F': 0}
-        for score in marks_dict.values():
-            if score >= 90:
-                distribution['A'] += 1
-            elif score >= 80:
-                distribution['B'] += 1
-            elif score >= 70:
-                distribution['C'] += 1
-            elif score >= 60:
-                distribution['D'] += 1
-            else:
-                distribution['F'] += 1
-        return distribution
-    
-    #TASK 5:PASS OR FAIL DETERMINATION
-    def pass_or_fail(marks_dict):
-        results = {}
-        passed = []
-        failed = []
-        for student, score in marks_dict.items():
-            if score >= 40:
-                results[student] = 'Pass'
-                passed.append(student)
-            else:
-                results[student] = 'Fail'
-                failed.append(student)
-        return passed,len(passed), failed, len(failed),results
-    
-    #PRINT RESULTS IN TABLE FORMAT
-    def print_results_table(marks_dict, grade_dist):
-
-        # Set fixed column widths for consistent spacing
-        NAME_WIDTH = 15
-        MARKS_WIDTH = 8
-        GRADE_WIDTH = 8
-        SEPARATOR = "-" * (NAME_WIDTH + MARKS_WIDTH + GRADE_WIDTH + 6) # +6 for the spaces
-        name=[]
-
-        # Header Row (Left-align Name, Right-align Marks and Grade)
-        header = f"{'Name':<{NAME_WIDTH}} | {'Marks':>{MARKS_WIDTH}} | {'Grade':>{GRADE_WIDTH}}"
-        print(header)
-        print(SEPARATOR)
-        l=len(marks_dict)
-
-        for i in marks_dict.items(): 
-            name=list(marks_dict.keys())
-
-        for j in range (len(name)):
-            print(f"{name[j]:<{NAME_WIDTH}} | {marks_dict[name[j]]:>{MARKS_WIDTH}} | {grade_dist[name[j]]:>{GRADE_WIDTH}}")
-        print()
-            
-    #__main__
-
-    #task1:introductory print statements
-    print("Gradebook Management System")
-    print("Presented to you by RONAK SAMAL from B.Tech CSE(FSD)-SECTION A roll no:2501350003")
+#BULK IMPORT:MARKS FROM CSV/JSON FILES, GROUPED BY SUBJECT OR SECTION
+NAME_COLUMNS = ('name', 'student', 'student_name')
+MARKS_COLUMNS = ('marks', 'mark', 'score')
+GROUP_COLUMNS = ('subject', 'section', 'course')
+
+def parse_mark(value):
+    mark = float(value)
+    return int(mark) if mark.is_integer() else mark
+
+def find_column(fields, candidates):
+    for i, field in enumerate(fields):
+        if field.strip().lower() in candidates:
+            return i
+    return None
+
+def iter_csv_marks(path, default_group):#BULK IMPORT:ONE ROW AT A TIME, THE FILE IS NEVER LOADED WHOLE
+    with open(path, 'r', newline='') as f:
+        reader = csv.reader(f)
+        header = next(reader, [])
+        name_col = find_column(header, NAME_COLUMNS)
+        marks_col = find_column(header, MARKS_COLUMNS)
+        group_col = find_column(header, GROUP_COLUMNS)
+        if name_col is None or marks_col is None:
+            raise ValueError(f"header needs a name column and a marks column, got {header}")
+        for line_number, row in enumerate(reader, 2):
+            if not row:
+                continue
+            try:
+                group = row[group_col].strip() if group_col is not None else default_group
+                yield group, row[name_col].strip(), parse_mark(row[marks_col])
+            except (IndexError, ValueError):
+                print(f"WARNING: Skipping bad row {line_number} in {path}: {row}")
+
+def iter_record_marks(records, path, default_group):
+    for record in records:
+        if not isinstance(record, dict):
+            print(f"WARNING: Skipping bad record in {path}: {record}")
+            continue
+        fields = {str(key).lower(): value for key, value in record.items()}
+        name_key = next((key for key in NAME_COLUMNS if key in fields), None)
+        marks_key = next((key for key in MARKS_COLUMNS if key in fields), None)
+        group_key = next((key for key in GROUP_COLUMNS if key in fields), None)
+        try:
+            yield (str(fields[group_key]) if group_key else default_group), str(fields[name_key]), parse_mark(fields[marks_key])
+        except (KeyError, TypeError, ValueError):
+            print(f"WARNING: Skipping bad record in {path}: {record}")
+
+def iter_json_lines(f, path):
+    for line_number, line in enumerate(f, 1):
+        if not line.strip():
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError:
+            print(f"WARNING: Skipping bad line {line_number} in {path}: {line.strip()}")
+
+def iter_mapping_marks(marks_dict, path, group):
+    for name, mark in marks_dict.items():
+        try:
+            yield group, name, parse_mark(mark)
+        except (TypeError, ValueError):
+            print(f"WARNING: Skipping bad record in {path}: {{{name!r}: {mark!r}}}")
+
+def iter_json_marks(path, default_group):#BULK IMPORT:JSON LINES ARE STREAMED, PLAIN JSON IS LOADED
+    with open(path, 'r') as f:
+        if path.endswith('.jsonl'):
+            yield from iter_record_marks(iter_json_lines(f, path), path, default_group)
+            return
+        data = json.load(f)
+    if isinstance(data, list):
+        # [{"name": ..., "marks": ..., "subject": ...}, ...]
+        yield from iter_record_marks(data, path, default_group)
+    elif not isinstance(data, dict):
+        raise ValueError(f"expected a list of records or an object of marks, got {type(data).__name__}")
+    elif data and all(isinstance(value, dict) for value in data.values()):
+        # {"subject": {"student": marks, ...}, ...}
+        for group, marks_dict in data.items():
+            yield from iter_mapping_marks(marks_dict, path, group)
+    else:
+        # {"student": marks, ...}, the same shape as marks_dict
+        yield from iter_mapping_marks(data, path, default_group)
+
+def iter_file_marks(path):
+    # Rows without a subject/section column are grouped under the file name
+    default_group = os.path.splitext(os.path.basename(path))[0]
+    if path.endswith(('.json', '.jsonl')):
+        return iter_json_marks(path, default_group)
+    return iter_csv_marks(path, default_group)
+
+def load_marks(paths):#BULK IMPORT:GROUP -> (NAMES, MARKS) ACROSS ALL FILES
+    groups = {}
+    for path in paths:
+        # Sizes before this file, so an unreadable file can be taken back out whole
+        sizes = {group: len(names) for group, (names, _) in groups.items()}
+        try:
+            for group, name, mark in iter_file_marks(path):
+                names, marks = groups.setdefault(group, ([], []))
+                names.append(name)
+                marks.append(mark)
+        except (OSError, ValueError) as e:
+            print(f"WARNING: Skipping file {path}: {e}")
+            for group in list(groups):
+                if group not in sizes:
+                    del groups[group]
+                else:
+                    names, marks = groups[group]
+                    del names[sizes[group]:], marks[sizes[group]:]
+    return {group: (np.array(names, dtype=object), np.array(marks)) for group, (names, marks) in groups.items()}
+
+def safe_file_name(group):
+    return "".join(c if c.isalnum() or c in "-_." else "_" for c in group) or "group"
+
+def write_group_results(group, names, marks, stats, output_dir):#BULK IMPORT:RESULTS TABLE, DISTRIBUTION AND PASS/FAIL FILES
+    base = os.path.join(output_dir, safe_file_name(group))
+    results = np.where(stats['passed'], 'Pass', 'Fail')
+    for suffix in ("_results.csv", "_results.txt"):
+        write_results_table(base + suffix, names, marks, stats['grades'], results)
+
+    passed = names[stats['passed']].tolist()
+    failed = names[~stats['passed']].tolist()
+    summary = {
+        'group': group,
+        'count': stats['count'],
+        'average': stats['average'],
+        'median': stats['median'],
+        'highest': {'name': stats['max_student'], 'marks': stats['max_score']},
+        'lowest': {'name': stats['min_student'], 'marks': stats['min_score']},
+        'distribution': stats['distribution'],
+        'passed': passed,
+        'failed': failed
+    }
+    with open(base + "_summary.json", 'w') as f:
+        json.dump(summary, f, indent=2)
+    return summary
+
+def run_batch(paths, output_dir):#BULK IMPORT:GRADE EVERY SUBJECT/SECTION IN THE GIVEN FILES
+    os.makedirs(output_dir, exist_ok=True)
+    summaries = []
+    for group, (names, marks) in load_marks(paths).items():
+        stats = analyze_marks(names, marks)
+        summary = write_group_results(group, names, marks, stats, output_dir)
+        summaries.append(summary)
+        print(f"{group}: {summary['count']} students, average {summary['average']:.2f}, "
+              f"median {summary['median']:.2f}, passed {len(summary['passed'])}, failed {len(summary['failed'])}")
+    print(f"Results for {len(summaries)} group(s) written to {output_dir}")
+    return summaries
+
+#ROLLUP:MERGEABLE PARTIAL STATISTICS PER COURSE, COMBINED FOR DEPARTMENTS AND THE UNIVERSITY
+# The median comes from a histogram sketch over the mark range: marks are counted in
+# SKETCH_RESOLUTION-wide bins, so sketches merge by adding and the median is exact for
+# marks given to one decimal place (and within half a bin otherwise)
+SKETCH_MIN = 0
+SKETCH_MAX = 100
+SKETCH_RESOLUTION = 0.1
+SKETCH_BINS = int(round((SKETCH_MAX - SKETCH_MIN) / SKETCH_RESOLUTION)) + 1
+
+def partial_stats(names, marks):#ROLLUP:EVERYTHING NEEDED TO MERGE WITHOUT THE RAW MARKS
+    names = np.asarray(names, dtype=object)
+    marks = np.asarray(marks, dtype=float)
+    partial = {
+        'count': int(marks.size),
+        'sum': float(marks.sum()),
+        'sum_sq': float(np.square(marks).sum()),
+        'min': None, 'min_student': None,
+        'max': None, 'max_student': None,
+        'passed': int(np.count_nonzero(marks >= PASS_MARK)),
+        'grade_counts': np.bincount(np.digitize(marks, GRADE_CUTOFFS), minlength=len(GRADE_LETTERS)),
+        'sketch': np.bincount(sketch_bins(marks), minlength=SKETCH_BINS)
+    }
+    if marks.size:
+        min_index, max_index = int(np.argmin(marks)), int(np.argmax(marks))
+        partial.update(min=float(marks[min_index]), min_student=names[min_index],
+                       max=float(marks[max_index]), max_student=names[max_index])
+    return partial
+
+def sketch_bins(marks):
+    bins = np.rint((marks - SKETCH_MIN) / SKETCH_RESOLUTION).astype(np.int64)
+    # Marks outside the range (bonus marks, penalties) go to the end bins
+    return np.clip(bins, 0, SKETCH_BINS - 1)
+
+def merge_partials(partials):#ROLLUP:COUNTS, SUMS AND HISTOGRAMS ADD UP; MIN/MAX KEEP THE EXTREME
+    merged = {'count': 0, 'sum': 0.0, 'sum_sq': 0.0, 'min': None, 'min_student': None,
+              'max': None, 'max_student': None, 'passed': 0,
+              'grade_counts': np.zeros(len(GRADE_LETTERS), dtype=np.int64),
+              'sketch': np.zeros(SKETCH_BINS, dtype=np.int64)}
+    for partial in partials:
+        for key in ('count', 'sum', 'sum_sq', 'passed', 'grade_counts', 'sketch'):
+            merged[key] = merged[key] + partial[key]
+        if partial['min'] is not None and (merged['min'] is None or partial['min'] < merged['min']):
+            merged['min'], merged['min_student'] = partial['min'], partial['min_student']
+        if partial['max'] is not None and (merged['max'] is None or partial['max'] > merged['max']):
+            merged['max'], merged['max_student'] = partial['max'], partial['max_student']
+    return merged
+
+def sketch_quantile(sketch, q):#ROLLUP:QUANTILE FROM THE HISTOGRAM SKETCH
+    count = int(sketch.sum())
+    if count == 0:
+        return 0
+    cumulative = np.cumsum(sketch)
+    # Same interpolation as np.median/np.quantile between the two nearest ranks
+    position = q * (count - 1)
+    lower_rank, upper_rank = int(np.floor(position)), int(np.ceil(position))
+    lower, upper = np.searchsorted(cumulative, [lower_rank + 1, upper_rank + 1])
+    value = lower + (upper - lower) * (position - lower_rank)
+    return float(SKETCH_MIN + value * SKETCH_RESOLUTION)
+
+def summarize_partial(partial):
+    count = partial['count']
+    average = partial['sum'] / count if count else 0
+    variance = max(partial['sum_sq'] / count - average ** 2, 0.0) if count else 0
+    return {
+        'count': count,
+        'average': average,
+        'std': variance ** 0.5,
+        'median': sketch_quantile(partial['sketch'], 0.5),
+        'highest': {'name': partial['max_student'], 'marks': partial['max']},
+        'lowest': {'name': partial['min_student'], 'marks': partial['min']},
+        'distribution': {letter: int(partial['grade_counts'][i]) for i, letter in reversed(list(enumerate(GRADE_LETTERS)))},
+        'passed': partial['passed'],
+        'pass_rate': partial['passed'] / count if count else 0
+    }
+
+def grade_course_file(path, output_dir):#ROLLUP:ONE WORKER TASK - GRADE A FILE'S COURSES AND RETURN THEIR PARTIALS
+    # The department is the folder the course file is in. A course can be split over several
+    # files, so each file's results go in a folder of their own named after the file
+    department = os.path.basename(os.path.dirname(os.path.abspath(path)))
+    course_dir = os.path.join(output_dir, safe_file_name(department), safe_file_name(os.path.basename(path)))
+    os.makedirs(course_dir, exist_ok=True)
+    results = []
+    for course, (names, marks) in load_marks([path]).items():
+        stats = analyze_marks(names, marks)
+        write_group_results(course, names, marks, stats, course_dir)
+        results.append((department, course, partial_stats(names, marks)))
+    return results
+
+def list_course_files(root):
+    files = []
+    for department in sorted(os.listdir(root)):
+        department_dir = os.path.join(root, department)
+        if os.path.isdir(department_dir):
+            files.extend(os.path.join(department_dir, name) for name in sorted(os.listdir(department_dir))
+                         if name.endswith(('.csv', '.json', '.jsonl')))
+    return files
+
+def run_rollup(root, output_dir, workers=None):#ROLLUP:ROOT/<DEPARTMENT>/<COURSE FILE> -> COURSE, DEPARTMENT AND UNIVERSITY RESULTS
+    files = list_course_files(root)
+    os.makedirs(output_dir, exist_ok=True)
+    course_parts = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for file_results in executor.map(grade_course_file, files, [output_dir] * len(files)):
+            for department, course, partial in file_results:
+                course_parts.setdefault(department, {}).setdefault(course, []).append(partial)
+    # Files holding the same course of a department are one cohort
+    courses = {department: {course: merge_partials(partials) for course, partials in parts.items()}
+               for department, parts in course_parts.items()}
+
+    departments = {department: merge_partials(course_partials.values()) for department, course_partials in courses.items()}
+    university = merge_partials(departments.values())
+    rollup = {
+        'university': summarize_partial(university),
+        'departments': {department: summarize_partial(partial) for department, partial in departments.items()},
+        'courses': {department: {course: summarize_partial(partial) for course, partial in course_partials.items()}
+                    for department, course_partials in courses.items()}
+    }
+    with open(os.path.join(output_dir, "rollup.json"), 'w') as f:
+        json.dump(rollup, f, indent=2)
+
+    print(f"{'Level':<30} | {'Students':>9} | {'Average':>8} | {'Median':>7} | {'Pass %':>7}")
+    print("-" * 74)
+    rows = [(f"{department}/{course}", summary) for department, course_summaries in rollup['courses'].items()
+            for course, summary in course_summaries.items()]
+    rows += [(department, summary) for department, summary in rollup['departments'].items()]
+    rows.append(("UNIVERSITY", rollup['university']))
+    for label, summary in rows:
+        print(f"{label:<30} | {summary['count']:>9} | {summary['average']:>8.2f} | "
+              f"{summary['median']:>7.2f} | {summary['pass_rate'] * 100:>6.1f}%")
+    print(f"Results for {len(files)} course file(s) written to {output_dir}")
+    return rollup
+
+def interactive_main(page_size=None):#TASK6:TO RUN THE LOOP TO ASK FOR PERMISSION:
+    ch=input("do you want to continue? (yes/no): ").lower()
+    while ch=="yes":
+
+        #task1:introductory print statements
+        print("Gradebook Management System")
+        print("Presented to you by RONAK SAMAL from B.Tech CSE(FSD)-SECTION A roll no:2501350003")
     
-    marks_dict = {}
-    n=int(input("Enter the number of students: "))
-    for i in range(n):
-        student_name = input("Enter the student's name: ")
-        student_marks = int(input("Enter the student's marks: "))
-        marks_dict[student_name] = student_marks
+        marks_dict = {}
+        n=int(input("Enter the number of students: "))
+        for i in range(n):
+            student_name = input("Enter the student's name: ")
+            student_marks = int(input("Enter the student's marks: "))
+            marks_dict[student_name] = student_marks
+
+        names, marks = marks_to_arrays(marks_dict)
+        stats = analyze_marks(names, marks)#ANALYTICS ENGINE:EVERYTHING BELOW IN ONE PASS
 
-    average_marks = calculate_average(marks_dict)#average calculation
-    print(f"Average Marks: {average_marks:.2f}")
+        average_marks = stats['average']#average calculation
+        print(f"Average Marks: {average_marks:.2f}")
 
-    median_marks = calculate_median(marks_dict)#median calculation
-    print(f"Median Marks: {median_marks:.2f}")
+        median_marks = stats['median']#median calculation
+        print(f"Median Marks: {median_marks:.2f}")
 
-    max_student, max_score = find_max_score(marks_dict)#TASK3:MAXIMUM SCORE FINDING
-    print(f"Highest Score: {max_student} with {max_score} marks")
+        max_student, max_score = stats['max_student'], stats['max_score']#TASK3:MAXIMUM SCORE FINDING
+        print(f"Highest Score: {max_student} with {max_score} marks")
+
+        min_student, min_score = stats['min_student'], stats['min_score']#TASK3:MINIMUM SCORE FINDING
+        print(f"Lowest Score: {min_student} with {min_score} marks")
+
+        print("Gradebook:")
+        grade_dist=dict(zip(names.tolist(), np.char.lower(stats['grades'].astype(str)).tolist()))#TASK4:GRADE ASSIGNMENT
+        print("grade dictionary:",grade_dist)
 
-    min_student, min_score = find_min_score(marks_dict)#TASK3:MINIMUM SCORE FINDING
-    print(f"Lowest Score: {min_student} with {min_score} marks")
+        distribution = stats['distribution'] #TASK4:GRADE DISTRIBUTION
+        print(f"Grade Distribution: {distribution}")
 
-    grade_dist=print_gradebook(marks_dict)#TASK4:GRADE ASSIGNMENT
-    print("grade dictionary:",grade_dist)
+        passed = names[stats['passed']].tolist()#TASK5:PASS OR FAIL DETERMINATION
+        failed = names[~stats['passed']].tolist()
+        num_passed, num_failed = len(passed), len(failed)
+        results = dict(zip(names.tolist(), np.where(stats['passed'], 'Pass', 'Fail').tolist()))
+        print(f"Passed Students ({num_passed}): {passed}")
+        print(f"Failed Students ({num_failed}): {failed}")
+        print("Results:",results)
 
-    distribution = grade_distribution(marks_dict) #TASK4:GRADE DISTRIBUTION
-    print(f"Grade Distribution: {distribution}")
+        print(print_results_table(marks_dict, grade_dist, page_size))#PRINT RESULTS IN TABLE FORMAT
+        ch=input("do you want to continue? (yes/no): ").lower()#TASK6:TO RUN THE LOOP TO ASK FOR PERMISSION:
 
-    passed, num_passed, failed, num_failed,results = pass_or_fail(marks_dict)#TASK5:PASS OR FAIL DETERMINATION
-    print(f"Passed Students ({num_passed}): {passed}")
-    print(f"Failed Students ({num_failed}): {failed}")
-    print("Results:",results)
+def main():
+    parser = argparse.ArgumentParser(description="Gradebook Management System")
+    parser.add_argument('--input', nargs='+', metavar='FILE',
+                        help="CSV, JSON or JSON lines files of student marks; without it the program asks interactively")
+    parser.add_argument('--rollup', metavar='DIR',
+                        help="Grade every course file in DIR/<department>/ and roll the results up to "
+                             "department and university level")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --rollup (default: all cores)")
+    parser.add_argument('--output-dir', default='gradebook_results', help="Directory for the result files")
+    parser.add_argument('--page-size', type=int, default=None,
+                        help="Show the interactive results table this many lines at a time")
+    args = parser.parse_args()
+    if args.rollup:
+        run_rollup(args.rollup, args.output_dir, args.workers)
+    elif args.input:
+        run_batch(args.input, args.output_dir)
+    else:
+        interactive_main(args.page_size)
 
-    print(print_results_table(marks_dict, grade_dist))#PRINT RESULTS IN TABLE FORMAT
-    ch=input("do you want to continue? (yes/no): ").lower()#TASK6:TO RUN THE LOOP TO ASK FOR PERMISSION:
\ No newline at end of file
+if __name__ == "__main__":
+    main()
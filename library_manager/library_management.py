@@ -1,9 +1,36 @@
-class Book:
-    def __init__(self, title: str, author: str, isbn: str, status: str = 'available'):
-        self.title = title
-        self.author = author
-        self.isbn = isbn
-        self.status = status.lower() 
+import argparse
+import csv
+import io
+import json
+import math
+import os
+import re
+import sqlite3
+import sys
+import threading
+import time
+import tracemalloc
+from array import array
+from collections import Counter, OrderedDict, defaultdict
+from contextlib import contextmanager, nullcontext
+from functools import lru_cache
+from itertools import chain
+
+# Statuses are stored as small ints; unknown values from old files get their own code
+STATUSES = ['available', 'issued']
+STATUS_CODES = {'available': 0, 'issued': 1}
+
+def status_code(status: str) -> int:
+    status = status.lower()
+    code = STATUS_CODES.get(status)
+    if code is None:
+        code = len(STATUSES)
+        STATUSES.append(sys.intern(status))
+        STATUS_CODES[STATUSES[code]] = code
+    return code
+
+class BookRecord:
+    __slots__ = ()
 
     def get_details(self) -> str:
         return f"'{self.title}' by {self.author} (ISBN: {self.isbn}) - Status: {self.status.capitalize()}"
@@ -11,8 +38,13 @@ class Book:
     def __repr__(self):
         return f"Book('{self.title}', '{self.author}', '{self.isbn}', '{self.status}')"
 
+    def to_csv_row(self) -> tuple[str, str, str, str]:
+        return (self.title, self.author, self.isbn, self.status)
+
     def to_csv_line(self) -> str:
-        return f"{self.title},{self.author},{self.isbn},{self.status}\n"
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator="\n").writerow(self.to_csv_row())
+        return buffer.getvalue()
 
     def issue(self):
         if self.is_available():
@@ -29,27 +61,290 @@ class Book:
     def is_available(self) -> bool:
         return self.status == 'available'
 
+class Book(BookRecord):
+    __slots__ = ('title', 'author', 'isbn', 'status_id')
+
+    def __init__(self, title: str, author: str, isbn: str, status: str = 'available'):
+        self.title = title
+        self.author = author
+        self.isbn = isbn
+        self.status = status
+
+    @property
+    def status(self) -> str:
+        return STATUSES[self.status_id]
+
+    @status.setter
+    def status(self, value: str):
+        self.status_id = status_code(value)
+
+class BookView(BookRecord):
+    # A lightweight handle on one row of a ColumnarBookStore
+    __slots__ = ('store', 'index')
+
+    def __init__(self, store, index: int):
+        self.store = store
+        self.index = index
+
+    @property
+    def title(self) -> str:
+        return self.store.titles[self.index]
+
+    @property
+    def author(self) -> str:
+        return self.store.authors[self.index]
+
+    @property
+    def isbn(self) -> str:
+        return self.store.isbns[self.index]
+
+    @property
+    def status(self) -> str:
+        return STATUSES[self.store.status_ids[self.index]]
+
+    @status.setter
+    def status(self, value: str):
+        self.store.status_ids[self.index] = status_code(value)
+
+class ColumnarBookStore:
+    # Column lists instead of one object per book; used in place of the books list
+    def __init__(self):
+        self.titles = []
+        self.authors = []
+        self.isbns = []
+        self.status_ids = array('B')
+
+    def append(self, book: BookRecord):
+        self.titles.append(book.title)
+        # Authors repeat a lot across a catalog, so share one string per name
+        self.authors.append(sys.intern(book.author))
+        self.isbns.append(book.isbn)
+        self.status_ids.append(status_code(book.status))
+
+    def __len__(self) -> int:
+        return len(self.isbns)
+
+    def __getitem__(self, index: int) -> BookView:
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("book index out of range")
+        return BookView(self, index)
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield BookView(self, index)
+
+CSV_HEADER = ("Title", "Author", "ISBN", "Status")
+# Large buffer so the catalog is read and written in big blocks rather than line by line
+CSV_BUFFER_SIZE = 1 << 20
+
+def parse_catalog_rows(file_handle):
+    # Shared by load_catalog and the SQLite bulk import. Rows are parsed with the csv
+    # module, so quoted fields may contain commas, quotes and newlines
+    for number, row in enumerate(csv.reader(file_handle)):
+        if number == 0 and [field.strip().lower() for field in row] == [name.lower() for name in CSV_HEADER]:
+            continue
+        if len(row) == 4:
+            title, author, isbn, status = row
+            yield Book(title, author, isbn, status.strip())
+        elif row:
+            print(f"WARNING: Skipping corrupted line in CSV: {','.join(row)}")
+
+def write_catalog_rows(file_handle, rows) -> int:
+    # rows is any iterable of (title, author, isbn, status); returns the number written
+    writer = csv.writer(file_handle, lineterminator="\n")
+    writer.writerow(CSV_HEADER)
+    written = 0
+    for row in rows:
+        writer.writerow(row)
+        written += 1
+    return written
+
+def rows_per_second(rows: int, seconds: float) -> str:
+    return f"{rows / seconds:,.0f} rows/s" if seconds > 0 else "n/a rows/s"
+
+def title_trigrams(text: str) -> set[str]:
+    text = text.lower()
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+WORD_PATTERN = re.compile(r"\w+")
+
+@lru_cache(maxsize=65536)
+def word_trigrams(word: str) -> tuple[str, ...]:
+    # Padded like pg_trgm, so short words and word starts still match; words repeat
+    # a lot across a catalog, hence the cache
+    padded = f"  {word} "
+    return tuple(padded[i:i + 3] for i in range(len(padded) - 2))
+
+@lru_cache(maxsize=65536)
+def fuzzy_trigrams(text: str) -> frozenset[str]:
+    # Cached too, since the same author appears on many books
+    grams = set()
+    for word in WORD_PATTERN.findall(text.lower()):
+        grams.update(word_trigrams(word))
+    return frozenset(grams)
+
+class FuzzyIndex:
+    # Trigram postings for titles and authors, keyed by whatever identifies a book
+    # (a position in the in-memory catalog, or a row id in SQLite)
+    FIELDS = ('title', 'author')
+
+    def __init__(self):
+        self.postings = {field: defaultdict(set) for field in self.FIELDS}
+        self.sizes = {field: {} for field in self.FIELDS}
+
+    def add(self, key, title: str, author: str):
+        for field, text in zip(self.FIELDS, (title, author)):
+            grams = fuzzy_trigrams(text)
+            self.sizes[field][key] = len(grams)
+            postings = self.postings[field]
+            for gram in grams:
+                postings[gram].add(key)
+
+    def search(self, query: str, limit: int = 10, min_score: float = 0.5) -> list[tuple[float, float, object]]:
+        """Rank books by how much of the query's trigrams appear in the title or author.
+
+        The score is the share of query trigrams found in the field, so a typo costs a few
+        trigrams rather than the whole match; ties go to the field closest in length
+        (trigram Jaccard). Returns (score, jaccard, key) tuples, best first.
+        """
+        grams = fuzzy_trigrams(query)
+        if not grams:
+            return []
+        needed = max(1, math.ceil(min_score * len(grams)))
+        best = {}
+        for field in self.FIELDS:
+            postings = self.postings[field]
+            ordered = sorted(grams, key=lambda gram: len(postings.get(gram, ())))
+            # A book sharing `needed` trigrams must contain one of the rarest
+            # len(grams) - needed + 1 of them, so only those can add candidates
+            seeds = len(grams) - needed + 1
+            counts = Counter(chain.from_iterable(postings.get(gram, ()) for gram in ordered[:seeds]))
+            for gram in ordered[seeds:]:
+                posting = postings.get(gram)
+                if posting:
+                    counts.update(counts.keys() & posting)
+            sizes = self.sizes[field]
+            for key, shared in counts.items():
+                if shared < needed:
+                    continue
+                match = (shared / len(grams), shared / (len(grams) + sizes[key] - shared))
+                if match > best.get(key, (0.0, 0.0)):
+                    best[key] = match
+        ranked = sorted(((score, jaccard, key) for key, (score, jaccard) in best.items()),
+                        key=lambda item: (-item[0], -item[1], item[2]))
+        return ranked[:limit]
+
 class LibraryInventory:
     FILE_NAME = "catalog.csv" 
+    SEARCH_CACHE_SIZE = 256
 
-    def __init__(self):
-        self.books = []
+    def __init__(self, columnar: bool = False):
+        self.books = ColumnarBookStore() if columnar else []
+        # ISBN -> position in self.books, and title trigram -> set of positions
+        self._isbn_index = {}
+        self._title_index = {}
+        # Built on the first fuzzy search, then kept up to date by _index_book
+        self._fuzzy_index = None
+        # Bumped whenever books are added; the fuzzy search cache is only valid for one version
+        self.catalog_version = 0
+        self._search_cache = OrderedDict()
+        self._search_cache_version = 0
         load_message = self.load_catalog()
         print(load_message)
 
+    def _index_book(self, position: int, book: Book):
+        # The first book with a given ISBN wins, like the old linear scan
+        self._isbn_index.setdefault(book.isbn, position)
+        for gram in title_trigrams(book.title):
+            self._title_index.setdefault(gram, set()).add(position)
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(position, book.title, book.author)
+        self.catalog_version += 1
+
     def add_book(self, book: Book):
         self.books.append(book)
+        self._index_book(len(self.books) - 1, book)
         return f"Added book: {book.title}"
 
     def search_by_title(self, title: str) -> list[Book]:
-        results = [book for book in self.books if title.lower() in book.title.lower()]
-        return results
+        query = title.lower()
+        grams = title_trigrams(query)
+        if not grams:
+            # Queries shorter than three characters cannot use the trigram index
+            return [book for book in self.books if query in book.title.lower()]
+
+        # Intersect the smallest posting sets first, then confirm the substring match
+        postings = sorted((self._title_index.get(gram, set()) for gram in grams), key=len)
+        candidates = set(postings[0])
+        for posting in postings[1:]:
+            if not candidates:
+                break
+            candidates &= posting
+        return [self.books[i] for i in sorted(candidates) if query in self.books[i].title.lower()]
+
+    def _get_fuzzy_index(self) -> FuzzyIndex:
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex()
+            for position, book in enumerate(self.books):
+                self._fuzzy_index.add(position, book.title, book.author)
+        return self._fuzzy_index
+
+    def _books_for_keys(self, keys: list) -> list[Book]:
+        return [self.books[position] for position in keys]
+
+    def search_fuzzy(self, query: str, limit: int = 10) -> list[Book]:
+        # Ranked matches on title or author that tolerate typos. Only the ranking is
+        # cached, so the books returned always show their current status
+        if self._search_cache_version != self.catalog_version:
+            self._search_cache.clear()
+            self._search_cache_version = self.catalog_version
+        cache_key = (query.strip().lower(), limit)
+        keys = self._search_cache.get(cache_key)
+        if keys is None:
+            keys = [key for _, _, key in self._get_fuzzy_index().search(query, limit)]
+            self._search_cache[cache_key] = keys
+            if len(self._search_cache) > self.SEARCH_CACHE_SIZE:
+                self._search_cache.popitem(last=False)
+        else:
+            self._search_cache.move_to_end(cache_key)
+        return self._books_for_keys(keys)
 
     def search_by_isbn(self, isbn: str) -> Book | None:
-        for book in self.books:
-            if book.isbn == isbn:
-                return book
-        return None
+        position = self._isbn_index.get(isbn)
+        if position is None:
+            return None
+        return self.books[position]
+
+    def issue_book(self, isbn: str) -> tuple[Book | None, bool]:
+        # Status changes go through the inventory so the ISBN lookup is the only search
+        book = self.search_by_isbn(isbn)
+        if book is None:
+            return None, False
+        return book, book.issue()
+
+    def return_book(self, isbn: str) -> tuple[Book | None, bool]:
+        book = self.search_by_isbn(isbn)
+        if book is None:
+            return None, False
+        return book, book.return_book()
+
+    @contextmanager
+    def batch(self):
+        # Everything done inside is stored with one write at the end; the CSV catalog
+        # is only ever written by save_catalog, so there is nothing to group here
+        yield
+
+    # Batch operations: one pass over the input, one result per item in input order
+    def add_many(self, books) -> list[str]:
+        return [self.add_book(book) for book in books]
+
+    def issue_many(self, isbns) -> list[tuple[str, Book | None, bool]]:
+        return [(isbn, *self.issue_book(isbn)) for isbn in isbns]
+
+    def return_many(self, isbns) -> list[tuple[str, Book | None, bool]]:
+        return [(isbn, *self.return_book(isbn)) for isbn in isbns]
 
     def display_all(self):
         if not self.books:
@@ -59,11 +354,12 @@ class LibraryInventory:
     def save_catalog(self):
         file_handle = None
         try:
-            file_handle = open(self.FILE_NAME, 'w')
-            file_handle.write("Title,Author,ISBN,Status\n") 
-            for book in self.books:
-                file_handle.write(book.to_csv_line())
-            print(f"INFO: Successfully saved {len(self.books)} books to {self.FILE_NAME}.")
+            started = time.perf_counter()
+            file_handle = open(self.FILE_NAME, 'w', newline='', buffering=CSV_BUFFER_SIZE)
+            saved = write_catalog_rows(file_handle, (book.to_csv_row() for book in self.books))
+            file_handle.flush()
+            elapsed = time.perf_counter() - started
+            print(f"INFO: Successfully saved {saved} books to {self.FILE_NAME} ({rows_per_second(saved, elapsed)}).")
             return True
         except IOError as e:
             print(f"ERROR: Could not save catalog to {self.FILE_NAME}. {e}")
@@ -74,38 +370,523 @@ class LibraryInventory:
 
     def load_catalog(self):
         file_handle = None
-        lines = []
         try:
-            file_handle = open(self.FILE_NAME, 'r')
-            lines = file_handle.readlines()
+            file_handle = open(self.FILE_NAME, 'r', newline='', buffering=CSV_BUFFER_SIZE)
+            if os.fstat(file_handle.fileno()).st_size == 0:
+                return f"INFO: File {self.FILE_NAME} is empty. Starting with an empty inventory."
+
+            # Books are built one row at a time as the file is read
+            started = time.perf_counter()
+            books_loaded = 0
+            for book in parse_catalog_rows(file_handle):
+                self.add_book(book)
+                books_loaded += 1
+            elapsed = time.perf_counter() - started
+            return (f"INFO: Successfully loaded {books_loaded} books from {self.FILE_NAME} "
+                    f"({rows_per_second(books_loaded, elapsed)}).")
         except FileNotFoundError:
             return f"INFO: {self.FILE_NAME} not found. Starting with an empty inventory."
         except IOError as e:
             return f"ERROR: An I/O error occurred during file load. {e}"
+        except csv.Error as e:
+            return f"ERROR: Data corruption found in {self.FILE_NAME}. Details: {e}"
         finally:
             if file_handle:
                 file_handle.close()
 
+class SQLiteLibraryInventory(LibraryInventory):
+    DB_NAME = "catalog.db"
+
+    def __init__(self, db_name: str | None = None):
+        self.db_name = db_name or self.DB_NAME
+        self.connection = sqlite3.connect(self.db_name)
+        with self.connection:
+            self.connection.execute(
+                "CREATE TABLE IF NOT EXISTS books ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "title TEXT NOT NULL, author TEXT NOT NULL, isbn TEXT NOT NULL, status TEXT NOT NULL)"
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_books_isbn ON books (isbn)")
+        # Rows stay in the database; self.books is left empty and never loaded.
+        # The fuzzy index is built from the table on first use, then added to as rows are inserted
+        self.batching = False
+        super().__init__()
+
+    def _row_to_book(self, row) -> Book:
+        return Book(row[0], row[1], row[2], row[3])
+
+    def _find_row(self, isbn: str):
+        return self.connection.execute(
+            "SELECT id, title, author, isbn, status FROM books WHERE isbn = ? ORDER BY id LIMIT 1", (isbn,)
+        ).fetchone()
+
+    @contextmanager
+    def batch(self):
+        # One transaction for everything inside; the operations join it instead of committing
+        with self.connection:
+            self.batching = True
+            try:
+                yield
+            finally:
+                self.batching = False
+
+    def _transaction(self):
+        return nullcontext() if self.batching else self.connection
+
+    def count(self) -> int:
+        return self.connection.execute("SELECT COUNT(*) FROM books").fetchone()[0]
+
+    def _last_id(self) -> int:
+        return self.connection.execute("SELECT COALESCE(MAX(id), 0) FROM books").fetchone()[0]
+
+    def _index_rows_after(self, last_id: int):
+        # Ids only grow (AUTOINCREMENT), so the rows just inserted are exactly those past last_id
+        if self._fuzzy_index is not None:
+            rows = self.connection.execute("SELECT id, title, author FROM books WHERE id > ?", (last_id,))
+            for row_id, title, author in rows:
+                self._fuzzy_index.add(row_id, title, author)
+        self.catalog_version += 1
+
+    def add_book(self, book: Book):
+        with self._transaction():
+            cursor = self.connection.execute(
+                "INSERT INTO books (title, author, isbn, status) VALUES (?, ?, ?, ?)",
+                (book.title, book.author, book.isbn, book.status)
+            )
+        if self._fuzzy_index is not None:
+            self._fuzzy_index.add(cursor.lastrowid, book.title, book.author)
+        self.catalog_version += 1
+        return f"Added book: {book.title}"
+
+    def add_many(self, books) -> list[str]:
+        books = list(books)
+        with self._transaction():
+            last_id = self._last_id()
+            self.connection.executemany(
+                "INSERT INTO books (title, author, isbn, status) VALUES (?, ?, ?, ?)",
+                (book.to_csv_row() for book in books)
+            )
+            self._index_rows_after(last_id)
+        return [f"Added book: {book.title}" for book in books]
+
+    def search_by_title(self, title: str) -> list[Book]:
+        rows = self.connection.execute(
+            "SELECT title, author, isbn, status FROM books WHERE instr(lower(title), ?) > 0 ORDER BY id",
+            (title.lower(),)
+        )
+        return [self._row_to_book(row) for row in rows]
+
+    def _get_fuzzy_index(self) -> FuzzyIndex:
+        if self._fuzzy_index is None:
+            self._fuzzy_index = FuzzyIndex()
+            for row_id, title, author in self.connection.execute("SELECT id, title, author FROM books"):
+                self._fuzzy_index.add(row_id, title, author)
+        return self._fuzzy_index
+
+    def _books_for_keys(self, keys: list) -> list[Book]:
+        if not keys:
+            return []
+        placeholders = ", ".join("?" * len(keys))
+        rows = self.connection.execute(
+            f"SELECT id, title, author, isbn, status FROM books WHERE id IN ({placeholders})", keys
+        )
+        books = {row[0]: self._row_to_book(row[1:]) for row in rows}
+        return [books[key] for key in keys if key in books]
+
+    def search_by_isbn(self, isbn: str) -> Book | None:
+        row = self._find_row(isbn)
+        return None if row is None else self._row_to_book(row[1:])
+
+    def _update_status(self, isbn: str, from_status: str, to_status: str) -> tuple[Book | None, bool]:
+        # Runs inside the caller's transaction
+        row = self._find_row(isbn)
+        if row is None:
+            return None, False
+        book = self._row_to_book(row[1:])
+        cursor = self.connection.execute(
+            "UPDATE books SET status = ? WHERE id = ? AND status = ?", (to_status, row[0], from_status)
+        )
+        changed = cursor.rowcount == 1
+        if changed:
+            book.status = to_status
+        return book, changed
+
+    def _change_status(self, isbn: str, from_status: str, to_status: str) -> tuple[Book | None, bool]:
+        # Single-row update, committed straight away so a crash cannot lose it
+        with self._transaction():
+            return self._update_status(isbn, from_status, to_status)
+
+    def _change_status_many(self, isbns, from_status: str, to_status: str) -> list[tuple[str, Book | None, bool]]:
+        # The whole batch is one transaction: one commit instead of one per book
+        with self._transaction():
+            return [(isbn, *self._update_status(isbn, from_status, to_status)) for isbn in isbns]
+
+    def issue_book(self, isbn: str) -> tuple[Book | None, bool]:
+        return self._change_status(isbn, 'available', 'issued')
+
+    def return_book(self, isbn: str) -> tuple[Book | None, bool]:
+        return self._change_status(isbn, 'issued', 'available')
+
+    def issue_many(self, isbns) -> list[tuple[str, Book | None, bool]]:
+        return self._change_status_many(isbns, 'available', 'issued')
+
+    def return_many(self, isbns) -> list[tuple[str, Book | None, bool]]:
+        return self._change_status_many(isbns, 'issued', 'available')
+
+    def display_all(self):
+        rows = self.connection.execute("SELECT title, author, isbn, status FROM books ORDER BY id")
+        details = [self._row_to_book(row).get_details() for row in rows]
+        return details if details else ["The inventory is empty."]
+
+    def import_csv(self, file_name: str) -> int:
+        # Streams the file and inserts all rows in one transaction
+        with open(file_name, 'r', newline='', buffering=CSV_BUFFER_SIZE) as file_handle, self._transaction():
+            before = self.count()
+            last_id = self._last_id()
+            self.connection.executemany(
+                "INSERT INTO books (title, author, isbn, status) VALUES (?, ?, ?, ?)",
+                (book.to_csv_row() for book in parse_catalog_rows(file_handle))
+            )
+            self._index_rows_after(last_id)
+            return self.count() - before
+
+    def save_catalog(self):
         try:
-            if not lines:
-                return f"INFO: File {self.FILE_NAME} is empty. Starting with an empty inventory."
-            
-            data_lines = lines[1:] if lines[0].strip().lower() == "title,author,isbn,status" else lines
+            self.connection.commit()
+            print(f"INFO: All changes are stored in {self.db_name} ({self.count()} books).")
+            return True
+        except sqlite3.Error as e:
+            print(f"ERROR: Could not commit catalog to {self.db_name}. {e}")
+            return False
 
-            books_loaded = 0
-            for line in data_lines:
-                parts = line.strip().split(',')
-                if len(parts) == 4:
-                    title, author, isbn, status = parts
-                    book = Book(title, author, isbn, status)
-                    self.books.append(book)
-                    books_loaded += 1
-                else:
-                    print(f"WARNING: Skipping corrupted line in CSV: {line.strip()}")
-            
-            return f"INFO: Successfully loaded {books_loaded} books from {self.FILE_NAME}."
-        except Exception as e:
-            return f"ERROR: Data corruption found in {self.FILE_NAME}. Starting with an empty inventory. Details: {e}"
+    def load_catalog(self):
+        try:
+            books = self.count()
+            if books == 0 and os.path.exists(self.FILE_NAME):
+                imported = self.import_csv(self.FILE_NAME)
+                return f"INFO: Imported {imported} books from {self.FILE_NAME} into {self.db_name}."
+            return f"INFO: Using {self.db_name} with {books} books."
+        except (IOError, sqlite3.Error) as e:
+            return f"ERROR: Could not open catalog database {self.db_name}. {e}"
+
+    def close(self):
+        self.connection.close()
+
+class JournaledLibraryInventory(LibraryInventory):
+    JOURNAL_NAME = "catalog.journal"
+    FLUSH_EVERY = 32
+    COMPACT_AFTER = 10000
+
+    def __init__(self, columnar: bool = False):
+        # lock guards the catalog and the pending lines; write_lock guards the journal file,
+        # so a slow write and fsync does not hold up new operations
+        self.lock = threading.RLock()
+        self.write_lock = threading.Lock()
+        self.pending = []
+        self.journal_lines = 0
+        self.replaying = False
+        self.batching = False
+        # Flush every FLUSH_EVERY operations; turned off when a caller schedules flushes itself
+        self.auto_flush = True
+        self.recovered = False
+        self.compaction_thread = None
+        # Only one compaction at a time: they share the .tmp snapshot and the .compacting journal
+        self.compaction_lock = threading.Lock()
+        # load_catalog reads the snapshot and replays the journal on top of it
+        super().__init__(columnar)
+        self.journal = open(self.JOURNAL_NAME, 'ab', buffering=0)
+        if self.recovered:
+            # Finish the interrupted compaction before accepting new operations
+            self.compact()
+
+    def _record(self, entry: dict):
+        # Called with self.lock held
+        if not self.replaying:
+            self.pending.append(json.dumps(entry) + "\n")
+
+    def _flush_if_due(self):
+        # Called after self.lock is released: write_lock is always taken before it
+        if self.auto_flush and not self.batching and len(self.pending) >= self.FLUSH_EVERY:
+            self.flush()
+
+    def _write_lines(self, lines: list[str]):
+        # Called with write_lock held. A failed write is cut off the journal again and the
+        # lines go back to the front of pending, so a retry cannot write an entry twice
+        if not lines:
+            return
+        data = memoryview("".join(lines).encode())
+        fd = self.journal.fileno()
+        start = os.fstat(fd).st_size
+        try:
+            while data:
+                data = data[self.journal.write(data):]
+            os.fsync(fd)
+        except OSError:
+            os.ftruncate(fd, start)
+            with self.lock:
+                self.pending[:0] = lines
+            raise
+        self.journal_lines += len(lines)
+
+    def flush(self, allow_compaction: bool = True):
+        # One write and fsync per batch of operations. Only taking the pending lines needs
+        # the catalog lock; operations carry on while they are written
+        with self.write_lock:
+            with self.lock:
+                lines, self.pending = self.pending, []
+            self._write_lines(lines)
+            if allow_compaction and self.journal_lines >= self.COMPACT_AFTER:
+                self.compact_in_background()
+
+    def add_book(self, book: Book):
+        with self.lock:
+            message = super().add_book(book)
+            self._record({'op': 'add', 'title': book.title, 'author': book.author,
+                          'isbn': book.isbn, 'status': book.status})
+        self._flush_if_due()
+        return message
+
+    def issue_book(self, isbn: str) -> tuple[Book | None, bool]:
+        with self.lock:
+            book, changed = super().issue_book(isbn)
+            if changed:
+                self._record({'op': 'issue', 'isbn': isbn})
+        self._flush_if_due()
+        return book, changed
+
+    def return_book(self, isbn: str) -> tuple[Book | None, bool]:
+        with self.lock:
+            book, changed = super().return_book(isbn)
+            if changed:
+                self._record({'op': 'return', 'isbn': isbn})
+        self._flush_if_due()
+        return book, changed
+
+    @contextmanager
+    def batch(self):
+        # Operations inside only queue their journal lines; one flush makes them all durable.
+        # The flush runs after the catalog lock is released, as write_lock comes first
+        outer = self.batching
+        self.batching = True
+        try:
+            yield
+        finally:
+            self.batching = outer
+            if not outer:
+                self.flush()
+
+    def _run_batch(self, operation, items) -> list:
+        # Hold the lock for the whole batch and make it durable with a single flush
+        with self.batch(), self.lock:
+            return operation(items)
+
+    def add_many(self, books) -> list[str]:
+        return self._run_batch(super().add_many, books)
+
+    def issue_many(self, isbns) -> list[tuple[str, Book | None, bool]]:
+        return self._run_batch(super().issue_many, isbns)
+
+    def return_many(self, isbns) -> list[tuple[str, Book | None, bool]]:
+        return self._run_batch(super().return_many, isbns)
+
+    def _replay(self, file_name: str) -> int:
+        applied = 0
+        with open(file_name, 'r') as file_handle:
+            for line in file_handle:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    # A torn last line from a crash mid-write
+                    print(f"WARNING: Skipping unreadable journal entry: {line.strip()}")
+                    continue
+                if entry['op'] == 'add':
+                    self.add_book(Book(entry['title'], entry['author'], entry['isbn'], entry['status']))
+                elif entry['op'] == 'issue':
+                    self.issue_book(entry['isbn'])
+                elif entry['op'] == 'return':
+                    self.return_book(entry['isbn'])
+                applied += 1
+        return applied
+
+    def load_catalog(self):
+        compacting = self.JOURNAL_NAME + ".compacting"
+        snapshot_tmp = self.FILE_NAME + ".tmp"
+        # An unfinished compaction: if the temporary snapshot still exists the old
+        # snapshot was not replaced yet and the rotated journal must be replayed too
+        if os.path.exists(snapshot_tmp):
+            os.remove(snapshot_tmp)
+            self.recovered = os.path.exists(compacting)
+        elif os.path.exists(compacting):
+            os.remove(compacting)
+
+        self.replaying = True
+        try:
+            message = super().load_catalog()
+            applied = 0
+            for file_name in (compacting, self.JOURNAL_NAME):
+                if os.path.exists(file_name):
+                    applied += self._replay(file_name)
+        finally:
+            self.replaying = False
+        self.journal_lines = applied
+        if applied:
+            message += f" Replayed {applied} journal entries."
+        return message
+
+    def compact(self):
+        with self.compaction_lock:
+            return self._compact()
+
+    def _compact(self):
+        compacting = self.JOURNAL_NAME + ".compacting"
+        snapshot_tmp = self.FILE_NAME + ".tmp"
+        with self.write_lock:
+            # The snapshot must match the journal being rotated out, so take both together
+            with self.lock:
+                lines, self.pending = self.pending, []
+                rows = [book.to_csv_row() for book in self.books]
+            self._write_lines(lines)
+            # Mark the compaction as started, then rotate the journal
+            open(snapshot_tmp, 'w').close()
+            self.journal.close()
+            os.replace(self.JOURNAL_NAME, compacting)
+            self.journal = open(self.JOURNAL_NAME, 'ab', buffering=0)
+            self.journal_lines = 0
+
+        # Writing the snapshot does not block new operations
+        with open(snapshot_tmp, 'w', newline='', buffering=CSV_BUFFER_SIZE) as file_handle:
+            written = write_catalog_rows(file_handle, rows)
+            file_handle.flush()
+            os.fsync(file_handle.fileno())
+        os.replace(snapshot_tmp, self.FILE_NAME)
+        os.remove(compacting)
+        return written
+
+    def compact_in_background(self):
+        if self.compaction_thread is not None and self.compaction_thread.is_alive():
+            return
+        self.compaction_thread = threading.Thread(target=self._compact_if_needed, daemon=True)
+        self.compaction_thread.start()
+
+    def _compact_if_needed(self):
+        # A compaction that finished while this thread waited may have made it unnecessary
+        with self.compaction_lock:
+            with self.write_lock:
+                needed = self.journal_lines >= self.COMPACT_AFTER
+            if needed:
+                self._compact()
+
+    def save_catalog(self):
+        # Every change is already in the journal, so saving only makes the last ones durable;
+        # catalog.csv is rewritten by compaction, not on every exit
+        try:
+            self.close()
+            print(f"INFO: All changes are stored in {self.JOURNAL_NAME} ({len(self.books)} books).")
+            return True
+        except IOError as e:
+            print(f"ERROR: Could not write journal {self.JOURNAL_NAME}. {e}")
+            return False
+
+    def close(self):
+        if self.journal.closed:
+            return
+        # Leave a long journal for the next run to compact rather than delaying exit
+        self.flush(allow_compaction=False)
+        if self.compaction_thread is not None:
+            self.compaction_thread.join()
+        self.journal.close()
+
+def memory_benchmark(count: int = 100000):
+    class PlainBook:
+        # The previous layout: one object with a __dict__ per book
+        def __init__(self, title, author, isbn, status='available'):
+            self.title = title
+            self.author = author
+            self.isbn = isbn
+            self.status = status.lower()
+
+    # Field strings are created up front so only the per-record layout is measured
+    titles = [f"Title {i}" for i in range(count)]
+    authors = [f"Author {i % 1000}" for i in range(count)]
+    isbns = [f"978-{i:010d}" for i in range(count)]
+
+    def build_plain():
+        return [PlainBook(titles[i], authors[i], isbns[i]) for i in range(count)]
+
+    def build_slots():
+        return [Book(titles[i], authors[i], isbns[i]) for i in range(count)]
+
+    def build_columnar():
+        store = ColumnarBookStore()
+        for i in range(count):
+            store.append(Book(titles[i], authors[i], isbns[i]))
+        return store
+
+    results = {}
+    for name, build in (('dict objects', build_plain), ('__slots__ objects', build_slots), ('columnar store', build_columnar)):
+        tracemalloc.start()
+        books = build()
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        results[name] = current
+        del books
+
+    print(f"Memory for {count:,} books (excluding the field strings):")
+    for name, size in results.items():
+        print(f"  {name:<18} {size / 1024 ** 2:>9.2f} MB  {size / count:>7.1f} bytes/book")
+    return results
+
+def read_batch_operations(file_name: str):
+    # One operation per CSV row: "issue,<isbn>", "return,<isbn>" or "add,<title>,<author>,<isbn>[,<status>]"
+    with open(file_name, 'r', newline='', buffering=CSV_BUFFER_SIZE) as file_handle:
+        for number, row in enumerate(csv.reader(file_handle), 1):
+            if not row or row[0].startswith('#'):
+                continue
+            op = row[0].strip().lower()
+            if op in ('issue', 'return') and len(row) == 2:
+                yield op, row[1].strip()
+            elif op == 'add' and len(row) in (4, 5):
+                yield op, Book(*(field.strip() for field in row[1:]))
+            else:
+                print(f"WARNING: Skipping invalid operation on line {number} of {file_name}: {','.join(row)}")
+
+def run_batch(inventory: LibraryInventory, file_name: str) -> dict:
+    # Consecutive operations of the same kind go to the batch APIs together; the
+    # order of the file is kept, so "issue X" followed by "return X" still works.
+    # The whole file is one inventory batch: a single fsync or commit at the end
+    batch_methods = {'add': inventory.add_many, 'issue': inventory.issue_many, 'return': inventory.return_many}
+    counts = {'add': 0, 'issue': 0, 'return': 0, 'failed': 0}
+    started = time.perf_counter()
+
+    def apply(op, items):
+        results = batch_methods[op](items)
+        if op == 'add':
+            counts['add'] += len(results)
+            return
+        for isbn, book, changed in results:
+            if changed:
+                counts[op] += 1
+            else:
+                counts['failed'] += 1
+                reason = "not found" if book is None else f"already {book.status}"
+                print(f"WARNING: Cannot {op} ISBN '{isbn}': {reason}.")
+
+    with inventory.batch():
+        current_op, items = None, []
+        for op, item in read_batch_operations(file_name):
+            if op != current_op and items:
+                apply(current_op, items)
+                items = []
+            current_op = op
+            items.append(item)
+        if items:
+            apply(current_op, items)
+
+    elapsed = time.perf_counter() - started
+    processed = counts['add'] + counts['issue'] + counts['return'] + counts['failed']
+    print(f"INFO: Added {counts['add']}, issued {counts['issue']}, returned {counts['return']}, "
+          f"failed {counts['failed']} ({rows_per_second(processed, elapsed)}).")
+    return counts
 
 def display_menu():
     print("\n" + "="*40)
@@ -165,12 +946,14 @@ def issue_return_book_cli(inventory: LibraryInventory, action: str):
         print(f"Found book: {book.get_details()}")
         
         if action == 'issue':
-            if book.issue():
+            _, changed = inventory.issue_book(isbn)
+            if changed:
                 print(f"SUCCESS: Successfully **issued** '{book.title}'. Status is now 'Issued'.")
             else:
                 print(f"WARNING: Cannot issue '{book.title}'. It is already issued.")
         elif action == 'return':
-            if book.return_book():
+            _, changed = inventory.return_book(isbn)
+            if changed:
                 print(f"SUCCESS: Successfully **returned** '{book.title}'. Status is now 'Available'.")
             else:
                 print(f"WARNING: Cannot return '{book.title}'. It is already available.")
@@ -195,8 +978,8 @@ def search_book_cli(inventory: LibraryInventory):
     print("\n--- Search Book ---")
     
     try:
-        print("Search by: (1) Title | (2) ISBN")
-        choice = input("Enter choice (1/2): ").strip()
+        print("Search by: (1) Title | (2) ISBN | (3) Fuzzy title/author")
+        choice = input("Enter choice (1/2/3): ").strip()
         
         if choice == '1':
             query = input("Enter part of the Title to search: ").strip()
@@ -224,7 +1007,21 @@ def search_book_cli(inventory: LibraryInventory):
                 print(book.get_details())
             else:
                 print(f"ERROR: No book found with ISBN '{query}'.")
-                
+
+        elif choice == '3':
+            query = input("Enter a title or author (typos are fine): ").strip()
+            if not query:
+                raise ValueError("Search query cannot be empty.")
+
+            results = inventory.search_fuzzy(query)
+
+            if results:
+                print(f"\nBest {len(results)} match(es) for '{query}':")
+                for i, book in enumerate(results, 1):
+                    print(f"{i}. {book.get_details()}")
+            else:
+                print(f"ERROR: No books found resembling '{query}'.")
+
         else:
             print("ERROR: Invalid search choice.")
             
@@ -232,7 +1029,47 @@ def search_book_cli(inventory: LibraryInventory):
         print(f"Search operation failed: {e}")
 
 def main():
-    inventory = LibraryInventory()
+    parser = argparse.ArgumentParser(description="Library Inventory Manager")
+    parser.add_argument('--backend', choices=['csv', 'sqlite', 'journal'], default='csv',
+                        help="csv rewrites catalog.csv on exit, sqlite writes every change to catalog.db, "
+                             "journal appends every change to catalog.journal")
+    parser.add_argument('--columnar', action='store_true',
+                        help="Keep the in-memory catalog in column arrays instead of Book objects")
+    parser.add_argument('--memory-benchmark', type=int, metavar='N', default=None,
+                        help="Compare the memory used by N books in each layout and exit")
+    parser.add_argument('--batch', metavar='FILE', default=None,
+                        help="Apply the add/issue/return operations listed in FILE, save once and exit")
+    parser.add_argument('--compact', action='store_true',
+                        help="With the journal backend, fold catalog.journal into catalog.csv and exit")
+    args = parser.parse_args()
+
+    if args.memory_benchmark:
+        memory_benchmark(args.memory_benchmark)
+        return
+    if args.compact and args.backend != 'journal':
+        print("ERROR: --compact only applies to the journal backend.")
+        return
+
+    if args.backend == 'sqlite':
+        inventory = SQLiteLibraryInventory()
+    elif args.backend == 'journal':
+        inventory = JournaledLibraryInventory(args.columnar)
+    else:
+        inventory = LibraryInventory(args.columnar)
+
+    if args.compact:
+        written = inventory.compact()
+        inventory.close()
+        print(f"INFO: Compacted {inventory.JOURNAL_NAME} into {inventory.FILE_NAME} ({written} books).")
+        return
+
+    if args.batch:
+        try:
+            run_batch(inventory, args.batch)
+        except IOError as e:
+            print(f"ERROR: Could not read batch file {args.batch}. {e}")
+        inventory.save_catalog()
+        return
     
     running = True
     while running:
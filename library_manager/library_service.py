@@ -0,0 +1,257 @@
+import argparse
+import asyncio
+import json
+import random
+import signal
+import time
+from contextlib import asynccontextmanager
+
+from library_management import JournaledLibraryInventory
+
+# One JSON object per line in each direction, e.g.
+#   {"op": "issue", "isbn": "978-0441172719"}  ->  {"ok": true, "changed": true, "book": {...}}
+# Supported ops: issue, return, lookup (by ISBN) and search (by title, optional "limit")
+HOST = "127.0.0.1"
+PORT = 8765
+SEARCH_LIMIT = 50
+# ISBNs the load test asks the server for; enough to spread the load without one huge reply
+LOAD_TEST_ISBNS = 10000
+# Seconds between attempts to flush the journal after a failed write, doubling up to the maximum
+RETRY_DELAY = 0.05
+MAX_RETRY_DELAY = 1.0
+# Longest line either side will read; a full-catalog search can be large
+STREAM_LIMIT = 64 * 1024 * 1024
+
+def book_to_dict(book) -> dict | None:
+    if book is None:
+        return None
+    return {'title': book.title, 'author': book.author, 'isbn': book.isbn, 'status': book.status}
+
+class IsbnLocks:
+    # One asyncio.Lock per ISBN that is currently in use; idle locks are dropped again
+    def __init__(self):
+        self.locks = {}
+        self.users = {}
+
+    @asynccontextmanager
+    async def hold(self, isbn: str):
+        lock = self.locks.setdefault(isbn, asyncio.Lock())
+        self.users[isbn] = self.users.get(isbn, 0) + 1
+        try:
+            async with lock:
+                yield
+        finally:
+            self.users[isbn] -= 1
+            if not self.users[isbn]:
+                del self.users[isbn]
+                del self.locks[isbn]
+
+class LibraryService:
+    def __init__(self, inventory: JournaledLibraryInventory, flush_interval: float = 0.01):
+        self.inventory = inventory
+        # persist_loop does all the flushing, off the event loop thread
+        self.inventory.auto_flush = False
+        self.flush_interval = flush_interval
+        self.isbn_locks = IsbnLocks()
+        # Futures of changes that are waiting for the next journal flush
+        self.waiting = []
+        self.changes_waiting = asyncio.Event()
+        self.requests = 0
+
+    async def persist_loop(self):
+        # Group commit: every change that arrived during the interval shares one fsync
+        while True:
+            await self.changes_waiting.wait()
+            await asyncio.sleep(self.flush_interval)
+            batch, self.waiting = self.waiting, []
+            self.changes_waiting.clear()
+            delay = RETRY_DELAY
+            while True:
+                try:
+                    await asyncio.to_thread(self.inventory.flush)
+                    break
+                except OSError as e:
+                    # The unwritten lines are still pending and their ISBNs stay locked, so a
+                    # change is only reported once it is in the journal
+                    print(f"ERROR: Could not write the journal, retrying in {delay:.2f}s. {e}")
+                    await asyncio.sleep(delay)
+                    delay = min(delay * 2, MAX_RETRY_DELAY)
+            for future in batch:
+                future.set_result(None)
+
+    async def wait_durable(self):
+        future = asyncio.get_running_loop().create_future()
+        self.waiting.append(future)
+        self.changes_waiting.set()
+        await future
+
+    async def change_status(self, op: str, isbn: str) -> dict:
+        # The ISBN stays locked until the change is in the journal, so a second
+        # client asking for the same copy only sees the durable result
+        async with self.isbn_locks.hold(isbn):
+            if op == 'issue':
+                book, changed = self.inventory.issue_book(isbn)
+            else:
+                book, changed = self.inventory.return_book(isbn)
+            if book is None:
+                return {'ok': False, 'error': f"Book with ISBN '{isbn}' not found."}
+            if changed:
+                await self.wait_durable()
+            return {'ok': True, 'changed': changed, 'book': book_to_dict(book)}
+
+    async def handle_request(self, request: dict) -> dict:
+        if not isinstance(request, dict):
+            return {'ok': False, 'error': "Bad request: expected a JSON object"}
+        op = request.get('op')
+        if op in ('issue', 'return'):
+            return await self.change_status(op, str(request.get('isbn', '')))
+        if op == 'lookup':
+            book = self.inventory.search_by_isbn(str(request.get('isbn', '')))
+            return {'ok': book is not None, 'book': book_to_dict(book)}
+        if op == 'search':
+            books = self.inventory.search_by_title(str(request.get('title', '')))
+            limit = int(request.get('limit', SEARCH_LIMIT))
+            return {'ok': True, 'count': len(books), 'books': [book_to_dict(book) for book in books[:limit]]}
+        return {'ok': False, 'error': f"Unknown op: {op!r}"}
+
+    async def handle_client(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    response = await self.handle_request(request)
+                except (ValueError, TypeError) as e:
+                    response = {'ok': False, 'error': f"Bad request: {e}"}
+                except OSError as e:
+                    response = {'ok': False, 'error': f"Server error: {e}"}
+                self.requests += 1
+                writer.write(json.dumps(response).encode() + b"\n")
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+async def serve(host: str, port: int, flush_interval: float, columnar: bool = False):
+    inventory = JournaledLibraryInventory(columnar)
+    service = LibraryService(inventory, flush_interval)
+    persister = asyncio.create_task(service.persist_loop())
+    server = await asyncio.start_server(service.handle_client, host, port, limit=STREAM_LIMIT)
+    try:
+        # Stop the same way as Ctrl+C so the catalog is still saved
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
+    print(f"INFO: Serving {len(inventory.books)} books on {host}:{port}. Press Ctrl+C to stop.")
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        persister.cancel()
+        print(f"\nINFO: Handled {service.requests} requests. Saving catalog...")
+        inventory.save_catalog()
+        inventory.close()
+
+def percentile(sorted_values: list[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+async def load_test_client(host: str, port: int, isbns: list[str], requests: int, seed: int) -> tuple[list[float], int]:
+    rng = random.Random(seed)
+    latencies = []
+    errors = 0
+    reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+    try:
+        for _ in range(requests):
+            roll = rng.random()
+            isbn = rng.choice(isbns)
+            if roll < 0.4:
+                request = {'op': 'issue', 'isbn': isbn}
+            elif roll < 0.8:
+                request = {'op': 'return', 'isbn': isbn}
+            elif roll < 0.9:
+                request = {'op': 'lookup', 'isbn': isbn}
+            else:
+                request = {'op': 'search', 'title': rng.choice(['the', 'of', 'python', 'data'])}
+            started = time.perf_counter()
+            writer.write(json.dumps(request).encode() + b"\n")
+            await writer.drain()
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - started)
+            if not response.get('ok'):
+                errors += 1
+    finally:
+        writer.close()
+        await writer.wait_closed()
+    return latencies, errors
+
+async def load_test(host: str, port: int, clients: int, requests: int, seed: int = 0) -> dict:
+    # Exercise ISBNs the server actually has: the first LOAD_TEST_ISBNS of a search that
+    # matches every title, so the reply stays small however large the catalog is
+    reader, writer = await asyncio.open_connection(host, port, limit=STREAM_LIMIT)
+    writer.write(json.dumps({'op': 'search', 'title': '', 'limit': LOAD_TEST_ISBNS}).encode() + b"\n")
+    await writer.drain()
+    books = json.loads(await reader.readline())['books']
+    writer.close()
+    await writer.wait_closed()
+    isbns = [book['isbn'] for book in books] or ['000-0000000000']
+
+    started = time.perf_counter()
+    results = await asyncio.gather(*(
+        load_test_client(host, port, isbns, requests, seed + i) for i in range(clients)
+    ))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for client_latencies, _ in results for latency in client_latencies)
+    total = len(latencies)
+    report = {
+        'clients': clients,
+        'requests': total,
+        'errors': sum(errors for _, errors in results),
+        'seconds': round(elapsed, 3),
+        'requests_per_second': round(total / elapsed) if elapsed else None,
+        'p50_ms': round(percentile(latencies, 0.50) * 1000, 3),
+        'p95_ms': round(percentile(latencies, 0.95) * 1000, 3),
+        'p99_ms': round(percentile(latencies, 0.99) * 1000, 3),
+        'max_ms': round(latencies[-1] * 1000, 3) if latencies else 0.0
+    }
+    print(f"{total} requests from {clients} clients in {elapsed:.2f}s "
+          f"({report['requests_per_second']} req/s, {report['errors']} errors)")
+    print(f"Latency p50 {report['p50_ms']} ms, p95 {report['p95_ms']} ms, "
+          f"p99 {report['p99_ms']} ms, max {report['max_ms']} ms")
+    return report
+
+def main():
+    parser = argparse.ArgumentParser(description="Library inventory service for several clerks at once")
+    parser.add_argument('--host', default=HOST)
+    parser.add_argument('--port', type=int, default=PORT)
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    serve_parser = subparsers.add_parser('serve', help="Serve the journaled catalog over a JSON line protocol")
+    serve_parser.add_argument('--flush-interval', type=float, default=0.01,
+                              help="Seconds to gather changes before one journal flush")
+    serve_parser.add_argument('--columnar', action='store_true',
+                              help="Keep the in-memory catalog in column arrays instead of Book objects")
+
+    load_parser = subparsers.add_parser('loadtest', help="Measure requests per second and latency of a running server")
+    load_parser.add_argument('--clients', type=int, default=50, help="Concurrent connections")
+    load_parser.add_argument('--requests', type=int, default=200, help="Requests per connection")
+    load_parser.add_argument('--seed', type=int, default=0)
+    load_parser.add_argument('--output', default=None, help="JSON lines file the results are appended to")
+    args = parser.parse_args()
+
+    if args.command == 'serve':
+        try:
+            asyncio.run(serve(args.host, args.port, args.flush_interval, args.columnar))
+        except (KeyboardInterrupt, asyncio.CancelledError):
+            pass
+    else:
+        report = asyncio.run(load_test(args.host, args.port, args.clients, args.requests, args.seed))
+        if args.output:
+            with open(args.output, 'a') as f:
+                f.write(json.dumps(report) + "\n")
+
+if __name__ == "__main__":
+    main()
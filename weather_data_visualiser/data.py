@@ -1,6 +1,26 @@
+import argparse
+import glob
+import hashlib
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow  # noqa: F401
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+MONTHS = [
+    'January', 'February', 'March', 'April', 'May', 'June',
+    'July', 'August', 'September', 'October', 'November', 'December'
+]
+
 def generate_sample_data(filename='weather_data.csv'):
     dates = pd.date_range(start='2023-01-01', end='2023-12-31', freq='D')
     np.random.seed(42)
@@ -52,12 +72,212 @@ def analyze_monthly_data(df):
         'Temperature': 'mean',
         'Rainfall': 'sum',
         'Humidity': 'mean'
-    }).reindex([
-        'January', 'February', 'March', 'April', 'May', 'June', 
-        'July', 'August', 'September', 'October', 'November', 'December'
-    ])
+    }).reindex(MONTHS)
     return monthly_stats
 
+class StreamingWeatherStats:
+    """Online version of clean_data + perform_statistical_analysis + analyze_monthly_data.
+
+    Chunks are folded into running totals, so memory does not grow with the file. The
+    temperature mean fill of clean_data needs the overall mean, which is only known at the
+    end; filled values equal that mean, so they add nothing to the squared deviations and
+    the monthly means can add them back as missing count * overall mean.
+    """
+
+    def __init__(self):
+        self.rows = 0
+        # Welford/Chan running mean and sum of squared deviations of the known temperatures
+        self.temp_count = 0
+        self.temp_mean = 0.0
+        self.temp_m2 = 0.0
+        self.temp_min = np.inf
+        self.temp_max = -np.inf
+        self.total_rainfall = 0.0
+        self.humidity_sum = 0.0
+        self.humidity_count = 0
+        # Last humidity reading, carried into the next chunk for the forward fill
+        self.last_humidity = np.nan
+        self.monthly = pd.DataFrame(
+            0.0, index=MONTHS,
+            columns=['rows', 'temp_sum', 'temp_missing', 'rain_sum', 'humidity_sum', 'humidity_count']
+        )
+
+    def update(self, chunk):
+        dates = pd.to_datetime(chunk['Date'])
+        temperature = chunk['Temperature'].astype(float)
+        rainfall = chunk['Rainfall'].fillna(0)
+        humidity = chunk['Humidity'].astype(float)
+        if len(humidity) and np.isnan(humidity.iloc[0]):
+            humidity.iloc[0] = self.last_humidity
+        humidity = humidity.ffill()
+        if len(humidity):
+            self.last_humidity = humidity.iloc[-1]
+
+        known = temperature.dropna().to_numpy()
+        if known.size:
+            chunk_mean = known.mean()
+            chunk_m2 = np.square(known - chunk_mean).sum()
+            count = self.temp_count + known.size
+            delta = chunk_mean - self.temp_mean
+            self.temp_mean += delta * known.size / count
+            self.temp_m2 += chunk_m2 + delta ** 2 * self.temp_count * known.size / count
+            self.temp_count = count
+            self.temp_min = min(self.temp_min, known.min())
+            self.temp_max = max(self.temp_max, known.max())
+
+        self.rows += len(chunk)
+        self.total_rainfall += rainfall.sum()
+        self.humidity_sum += humidity.sum()
+        self.humidity_count += humidity.count()
+
+        monthly = pd.DataFrame({
+            'rows': 1.0,
+            'temp_sum': temperature.fillna(0),
+            'temp_missing': temperature.isna().astype(float),
+            'rain_sum': rainfall,
+            'humidity_sum': humidity.fillna(0),
+            'humidity_count': humidity.notna().astype(float)
+        }).groupby(dates.dt.month_name().to_numpy()).sum()
+        self.monthly = self.monthly.add(monthly, fill_value=0)
+
+    def stats(self):
+        # Same keys and ddof=0 standard deviation as perform_statistical_analysis; with no
+        # temperature readings at all the mean fill leaves NaN, and so do the statistics
+        known = self.temp_count > 0
+        return {
+            'mean_temp': self.temp_mean if known else np.nan,
+            'max_temp': self.temp_max if known else np.nan,
+            'min_temp': self.temp_min if known else np.nan,
+            'std_temp': np.sqrt(self.temp_m2 / self.rows) if known else np.nan,
+            'total_rainfall': self.total_rainfall,
+            'avg_humidity': self.humidity_sum / self.humidity_count if self.humidity_count else np.nan
+        }
+
+    def monthly_stats(self):
+        monthly = self.monthly.reindex(MONTHS)
+        # Months without any rows come out as NaN, like the groupby + reindex version
+        seen = monthly['rows'] > 0
+        fill = self.temp_mean if self.temp_count else np.nan
+        monthly_stats = pd.DataFrame({
+            'Temperature': (monthly['temp_sum'] + monthly['temp_missing'] * fill) / monthly['rows'],
+            'Rainfall': monthly['rain_sum'],
+            'Humidity': monthly['humidity_sum'] / monthly['humidity_count']
+        }).where(seen)
+        monthly_stats.index.name = 'Month'
+        return monthly_stats
+
+def stream_file(filename, chunksize=100_000):
+    accumulator = StreamingWeatherStats()
+    for chunk in pd.read_csv(filename, chunksize=chunksize):
+        accumulator.update(chunk)
+    return accumulator
+
+def analyze_streaming(filename, chunksize=100_000):
+    accumulator = stream_file(filename, chunksize)
+    return accumulator.stats(), accumulator.monthly_stats()
+
+# Cleaned data and analysis results are cached next to, never in place of, the raw file.
+# Entries are keyed by a hash of the raw file's bytes, so any edit to it is a cache miss;
+# bump CACHE_VERSION when clean_data or the analysis functions change, which retires
+# both the cleaned data and the stages written by the old code
+CACHE_DIR = '.weather_cache'
+CACHE_VERSION = 1
+CLEANED_SUFFIX = '.parquet' if HAS_PYARROW else '.pkl'
+
+def file_digest(filename, block_size=1 << 20):
+    digest = hashlib.sha256()
+    with open(filename, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def write_atomic(path, write):
+    # Write to a temporary name first so a crash, or another process, never sees half a file
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    write(tmp_path)
+    os.replace(tmp_path, path)
+
+def drop_cache_entry(path, error):
+    # A stale or corrupt entry (e.g. pickled by another pandas version) is recomputed, not fatal
+    print(f"Ignoring unreadable cache entry {os.path.basename(path)}: {error}")
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+def load_cleaned_data(filename, digest, cache_dir=CACHE_DIR):
+    path = os.path.join(cache_dir, f"{digest}.cleaned.v{CACHE_VERSION}{CLEANED_SUFFIX}")
+    if os.path.exists(path):
+        try:
+            return pd.read_parquet(path) if HAS_PYARROW else pd.read_pickle(path)
+        except Exception as e:
+            drop_cache_entry(path, e)
+
+    cleaned_df = clean_data(pd.read_csv(filename))
+    os.makedirs(cache_dir, exist_ok=True)
+    if HAS_PYARROW:
+        write_atomic(path, lambda tmp_path: cleaned_df.to_parquet(tmp_path, index=False))
+    else:
+        write_atomic(path, lambda tmp_path: cleaned_df.to_pickle(tmp_path, compression=None))
+    return cleaned_df
+
+def stages_path(digest, cache_dir=CACHE_DIR):
+    return os.path.join(cache_dir, f"{digest}.stages.v{CACHE_VERSION}.pkl")
+
+def load_stages(digest, cache_dir=CACHE_DIR):
+    path = stages_path(digest, cache_dir)
+    try:
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        drop_cache_entry(path, e)
+        return None
+
+def save_stages(digest, stages, cache_dir=CACHE_DIR):
+    os.makedirs(cache_dir, exist_ok=True)
+
+    def write(tmp_path):
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(stages, f)
+
+    write_atomic(stages_path(digest, cache_dir), write)
+
+def analyze_file(filename, cache_dir=CACHE_DIR, streaming=False, chunksize=100_000, need_data=False):
+    """Return ({'stats', 'monthly_stats', 'rows', 'cached'}, cleaned_df).
+
+    The stats and monthly stages are memoized per raw file hash, so an unchanged file goes
+    straight to the report. cleaned_df is only loaded when the stages have to be computed
+    in memory or need_data is set (for the plots); otherwise it is None. cache_dir=None
+    disables caching.
+    """
+    digest = file_digest(filename) if cache_dir else None
+    stages = load_stages(digest, cache_dir) if cache_dir else None
+
+    cleaned_df = None
+    if need_data or (stages is None and not streaming):
+        if cache_dir:
+            cleaned_df = load_cleaned_data(filename, digest, cache_dir)
+        else:
+            cleaned_df = clean_data(pd.read_csv(filename))
+
+    if stages is not None:
+        return {**stages, 'cached': True}, cleaned_df
+
+    if streaming:
+        accumulator = stream_file(filename, chunksize)
+        stats, monthly_stats, rows = accumulator.stats(), accumulator.monthly_stats(), accumulator.rows
+    else:
+        stats = perform_statistical_analysis(cleaned_df)
+        # analyze_monthly_data adds a Month column, so work on a copy
+        monthly_stats = analyze_monthly_data(cleaned_df.copy())
+        rows = len(cleaned_df)
+    stages = {'stats': stats, 'monthly_stats': monthly_stats, 'rows': rows}
+    if cache_dir:
+        save_stages(digest, stages, cache_dir)
+    return {**stages, 'cached': False}, cleaned_df
+
 def create_visualizations(df, monthly_stats):
     ax1 = df.plot(x='Date', y='Temperature', kind='line', title='Daily Temperature Trends', color='orange', figsize=(12, 6))
     ax1.set_ylabel('Temperature (C)')
@@ -81,8 +301,8 @@ def create_visualizations(df, monthly_stats):
     axes[0].figure.tight_layout()
     axes[0].figure.savefig('combined_weather_plot.png')
 
-def generate_report(stats, monthly_stats):
-    with open('weather_analysis_report.txt', 'w') as f:
+def generate_report(stats, monthly_stats, path='weather_analysis_report.txt'):
+    with open(path, 'w') as f:
         f.write("WEATHER DATA ANALYSIS REPORT\n")
         f.write("============================\n\n")
         
@@ -99,27 +319,112 @@ def generate_report(stats, monthly_stats):
         f.write("----------------------\n")
         f.write(monthly_stats.to_string())
 
+def list_station_files(source):
+    # A directory means every CSV in it; anything else is used as a glob pattern
+    if os.path.isdir(source):
+        return sorted(glob.glob(os.path.join(source, '*.csv')))
+    return sorted(glob.glob(source))
+
+def station_names(files):
+    # Each station is named by its path below the folder all the files share, so
+    # stations/*/readings.csv gives north/readings, south/readings, ...
+    root = os.path.commonpath([os.path.dirname(os.path.abspath(f)) for f in files])
+    paths = [os.path.relpath(os.path.abspath(f), root) for f in files]
+    names = [os.path.splitext(path)[0] for path in paths]
+    # Keep the extensions if dropping them would make two stations the same
+    return names if len(set(names)) == len(names) else paths
+
+def process_station(filename, station, output_dir, streaming=False, chunksize=100_000, cache_dir=CACHE_DIR):
+    # Runs in a worker process: one station file in, one report out. Reports mirror the
+    # station name, so stations from different folders do not overwrite each other
+    start = time.perf_counter()
+    stages, _ = analyze_file(filename, cache_dir, streaming, chunksize)
+    report_path = os.path.join(output_dir, f"{station}_report.txt")
+    os.makedirs(os.path.dirname(report_path), exist_ok=True)
+    generate_report(stages['stats'], stages['monthly_stats'], report_path)
+    return {'station': station, 'rows': stages['rows'], 'cached': stages['cached'],
+            'seconds': time.perf_counter() - start, **stages['stats']}
+
+def analyze_stations(source, output_dir='station_reports', workers=None, streaming=False, chunksize=100_000,
+                     cache_dir=CACHE_DIR):
+    files = list_station_files(source)
+    if not files:
+        print(f"No station files found for {source}")
+        return None
+    os.makedirs(output_dir, exist_ok=True)
+
+    results = []
+    start = time.perf_counter()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(process_station, filename, station, output_dir, streaming, chunksize, cache_dir): filename
+                   for filename, station in zip(files, station_names(files))}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                result = future.result()
+            except Exception as e:
+                print(f"[{done}/{len(files)}] {futures[future]}: failed ({e})")
+                continue
+            results.append(result)
+            if result['cached']:
+                throughput = ", cached"
+            else:
+                throughput = f", {result['rows'] / result['seconds']:,.0f} rows/s"
+            print(f"[{done}/{len(files)}] {result['station']}: {result['seconds']:.2f}s{throughput}")
+    elapsed = time.perf_counter() - start
+    if not results:
+        print(f"All {len(files)} stations failed in {elapsed:.2f}s; no summary written")
+        return None
+
+    summary = pd.DataFrame(results).set_index('station').sort_index()
+    summary = summary[['mean_temp', 'max_temp', 'min_temp', 'std_temp', 'total_rainfall', 'avg_humidity', 'rows', 'seconds']]
+    summary.to_csv(os.path.join(output_dir, 'station_summary.csv'))
+    with open(os.path.join(output_dir, 'station_summary.txt'), 'w') as f:
+        f.write("CROSS-STATION SUMMARY\n")
+        f.write("=====================\n\n")
+        f.write(summary.drop(columns=['rows', 'seconds']).round(2).to_string())
+    print(summary.drop(columns=['rows', 'seconds']).round(2).to_string())
+    print(f"Processed {len(results)} of {len(files)} stations in {elapsed:.2f}s. Reports written to {output_dir}")
+    return summary
+
 def main():
+    parser = argparse.ArgumentParser(description="Weather data analysis and visualization")
+    parser.add_argument('--streaming', action='store_true',
+                        help="Read the CSV in chunks with bounded memory and write only the report")
+    parser.add_argument('--chunksize', type=int, default=100_000, help="Rows per chunk in streaming mode")
+    parser.add_argument('--stations', metavar='DIR_OR_GLOB',
+                        help="Analyze every station CSV in a directory (or matching a glob) in parallel")
+    parser.add_argument('--workers', type=int, default=None, help="Worker processes for --stations (default: all cores)")
+    parser.add_argument('--output-dir', default='station_reports', help="Directory for the --stations reports")
+    parser.add_argument('--cache-dir', default=CACHE_DIR, help="Where cleaned data and analysis results are cached")
+    parser.add_argument('--no-cache', action='store_true', help="Always clean and analyze from the raw file")
+    args = parser.parse_args()
     filename = 'weather_data.csv'
-    
-    try:
-        df = pd.read_csv(filename)
-    except FileNotFoundError:
+    cache_dir = None if args.no_cache else args.cache_dir
+
+    if args.stations:
+        summary = analyze_stations(args.stations, args.output_dir, args.workers, args.streaming, args.chunksize, cache_dir)
+        if summary is None:
+            # No station could be analyzed; let batch jobs see the failure
+            sys.exit(1)
+        return
+
+    if not os.path.exists(filename):
         generate_sample_data(filename)
-        df = pd.read_csv(filename)
-    
-    cleaned_df = clean_data(df)
-    
-    cleaned_df.to_csv('weather_data.csv', index=False)
-    
-    stats = perform_statistical_analysis(cleaned_df)
-    monthly_stats = analyze_monthly_data(cleaned_df)
+
+    if args.streaming:
+        stages, _ = analyze_file(filename, cache_dir, streaming=True, chunksize=args.chunksize)
+        generate_report(stages['stats'], stages['monthly_stats'])
+        print(f"Streaming analysis complete{' (cached)' if stages['cached'] else ''}. Generated: report.")
+        return
+
+    # The raw file is only read; the cleaned frame lives in the cache
+    stages, cleaned_df = analyze_file(filename, cache_dir, need_data=True)
     
-    create_visualizations(cleaned_df, monthly_stats)
+    create_visualizations(cleaned_df, stages['monthly_stats'])
     
-    generate_report(stats, monthly_stats)
+    generate_report(stages['stats'], stages['monthly_stats'])
     
-    print("Analysis complete. Generated: cleaned data, plots, and report.")
+    print(f"Analysis complete{' (cached)' if stages['cached'] else ''}. Generated: plots and report.")
 
 if __name__ == "__main__":
     main()
\ No newline at end of file